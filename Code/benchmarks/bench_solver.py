@@ -0,0 +1,61 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Compares the bitmask and dancing-links solvers against the original
+# recursive backtracker.
+# Run from the Code directory:  python benchmarks/bench_solver.py
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nexus_sudoku.solver import BitmaskSolver, solve_backtracking
+from nexus_sudoku.dlx import DLXSolver
+
+PUZZLES = {
+    "easy": "530070000600195000098000060800060003400803001700020006060000280000419005000080079",
+    "hard": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    "empty": "0" * 81,
+}
+
+
+def parse(text):
+    return [[int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+
+
+def bench(fn, board, repeat):
+    best = None
+    for _ in range(repeat):
+        grid = copy.deepcopy(board)
+        start = time.perf_counter()
+        fn(grid)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best
+
+
+def run_bitmask(grid):
+    solver = BitmaskSolver(grid)
+    assert solver.solve()
+    return solver.nodes
+
+
+def run_dlx(grid):
+    assert DLXSolver(grid).solve()
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'puzzle':<8}{'backtracker':>14}{'bitmask':>12}{'dlx':>12}{'speedup':>10}")
+    for name, text in PUZZLES.items():
+        board = parse(text)
+        slow = bench(solve_backtracking, board, repeat)
+        fast = bench(run_bitmask, board, repeat)
+        links = bench(run_dlx, board, repeat)
+        print(f"{name:<8}{slow * 1000:>12.2f}ms{fast * 1000:>10.2f}ms{links * 1000:>10.2f}ms{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Reproducible benchmark suite. Corpora are generated from a fixed seed
+# (easy/medium/hard at the game's clue counts) plus well-known hard puzzles,
+# and every metric is written to a JSON file and checked against the floors
+# and ceilings in thresholds.json (and, optionally, a previous run).
+# Exits with status 1 when a metric regresses.
+#
+# Absolute timings only mean something on the machine that produced them, so
+# each run first times a fixed pure-Python calibration loop. The limits in
+# thresholds.json were set on a machine whose loop ran at the "calibration"
+# rate stored there; they are scaled by this machine's rate against it, and
+# a baseline run is scaled the same way by the rate it recorded. The widget
+# timings have no thresholds yet, as none have been measured on a display;
+# use --baseline to track them.
+#
+# Run from the Code directory:
+#   python benchmarks/bench_suite.py [-o results.json] [--baseline old.json]
+# The widget benchmarks need a display; on a headless machine use
+#   xvfb-run python benchmarks/bench_suite.py
+# or they are reported as skipped.
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, CODE_DIR)
+
+from nexus_sudoku.board import Board
+from nexus_sudoku.sudoku import Sudoku
+from nexus_sudoku.solver import BitmaskSolver, solve_backtracking
+from nexus_sudoku.dlx import DLXSolver, count_solutions
+from nexus_sudoku.generator import DIFFICULTY_CLUES, FullBoardGenerator, make_unique_puzzle
+
+SEED = 2025
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# Published puzzles that are hard for people and for solvers alike.
+KNOWN_HARD = {
+    "inkala": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    "platinum_blonde": "000000012000000003002300400001800005060070800000009000008500000900040500470006000",
+    "golden_nugget": "000000039000001005003050800008090006070002000100400000009080050020000600400700000",
+    "norvig_hardest": "400000805030000000000700000020000060000080400000010000000603070500200000104000000",
+    "easter_monster": "100000002090400050006000700050903000000070000000850040700000600030009080002000001",
+}
+
+
+def make_corpora(size, seed=SEED):
+    # Returns ({name: [Board]}, generation metrics). Same seed, same corpora.
+    rng = random.Random(seed)
+    generator = FullBoardGenerator(rng)
+    corpora = {}
+    metrics = {}
+    start = time.perf_counter()
+    for _ in range(size):
+        generator.generate()
+    metrics["generate.full_board"] = rate(size, time.perf_counter() - start, "boards/s")
+    for difficulty, clues in DIFFICULTY_CLUES.items():
+        puzzles = []
+        start = time.perf_counter()
+        for _ in range(size):
+            puzzle, attempts = make_unique_puzzle(generator.generate_board(), clues, rng)
+            puzzles.append(puzzle)
+        metrics[f"generate.puzzle.{difficulty}"] = rate(size, time.perf_counter() - start, "puzzles/s")
+        corpora[difficulty] = puzzles
+    corpora["known_hard"] = [Board.from_string(text) for text in KNOWN_HARD.values()]
+    return corpora, metrics
+
+
+def rate(count, seconds, unit):
+    return {"value": count / seconds, "unit": unit, "better": "higher"}
+
+
+def latency(seconds, unit="ms"):
+    return {"value": seconds * 1000, "unit": unit, "better": "lower"}
+
+
+def run_sudoku(board):
+    assert Sudoku(board).solve()
+
+
+def run_bitmask(board):
+    assert BitmaskSolver(board).solve()
+
+
+def run_dlx(board):
+    assert DLXSolver(board).solve()
+
+
+def run_unique(board):
+    assert count_solutions(board, limit=2) == 1
+
+
+def run_backtracking(board):
+    assert solve_backtracking(board.to_lists())
+
+
+# (name, function, corpora it runs on); the original backtracker can take
+# seconds on the published hard puzzles, so it only gets generated ones.
+ENGINES = (
+    ("sudoku", run_sudoku, None),
+    ("bitmask", run_bitmask, None),
+    ("dlx", run_dlx, None),
+    ("dlx_unique", run_unique, None),
+    ("backtracking", run_backtracking, ("easy", "medium", "hard")),
+)
+
+
+def calibration_loop(_):
+    # Integer arithmetic, list indexing and branches, like the solvers.
+    cells = list(range(81))
+    total = 0
+    for _ in range(100):
+        for idx in range(81):
+            if cells[idx] & 1:
+                total += cells[idx] >> 1
+            else:
+                total ^= idx
+    return total
+
+
+def calibrate(min_time, repeat):
+    # Calibration loops per second on this machine.
+    return time_corpus(calibration_loop, (None,), min_time, repeat)
+
+
+def time_corpus(fn, corpus, min_time, repeat):
+    # Best of `repeat` runs, each looping over the corpus for at least min_time.
+    best = None
+    for _ in range(repeat):
+        solved = 0
+        start = time.perf_counter()
+        while True:
+            for board in corpus:
+                fn(board)
+            solved += len(corpus)
+            took = time.perf_counter() - start
+            if took >= min_time:
+                break
+        speed = solved / took
+        best = speed if best is None else max(best, speed)
+    return best
+
+
+def bench_solvers(corpora, min_time, repeat):
+    metrics = {}
+    for name, fn, only in ENGINES:
+        for corpus_name, corpus in corpora.items():
+            if only is None or corpus_name in only:
+                speed = time_corpus(fn, corpus, min_time, repeat)
+                metrics[f"solve.{name}.{corpus_name}"] = {"value": speed, "unit": "solves/s", "better": "higher"}
+    try:
+        from nexus_sudoku import batch
+    except ImportError:
+        return metrics
+    grids = batch.as_grids(corpora["easy"] * max(1, 2048 // len(corpora["easy"])))
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        batch.validate(grids)
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    metrics["batch.validate"] = rate(len(grids), best, "grids/s")
+    return metrics
+
+
+def bench_widgets(repeat):
+    # Builds the board with each renderer inside a throwaway working
+    # directory, so the app's database and journal never touch real files.
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        return {}, f"no display ({e})"
+    try:
+        import sudokuCode
+    except ImportError as e:
+        root.destroy()
+        return {}, f"cannot import the game ({e})"
+    saved = sudokuCode.PUZZLE_POOL_DEPTH, sudokuCode.RATED_PUZZLES
+    sudokuCode.PUZZLE_POOL_DEPTH = 0
+    sudokuCode.RATED_PUZZLES = False
+    cwd = os.getcwd()
+    metrics = {}
+    # The working directory is restored, and the database and journal
+    # closed, before the scratch directory is removed.
+    with tempfile.TemporaryDirectory(prefix="nexus-bench-") as scratch:
+        os.chdir(scratch)
+        try:
+            root.withdraw()
+            for renderer in ("entries", "canvas"):
+                app = sudokuCode.SudokuApp(root, renderer=renderer)
+                app.username = "bench"
+                app.start_game("easy")
+                root.update_idletasks()
+                for label, fn in (("create_board", app.create_board), ("fill_entries", app.fill_entries)):
+                    best = None
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        fn()
+                        root.update_idletasks()
+                        took = time.perf_counter() - start
+                        best = took if best is None else min(best, took)
+                    metrics[f"ui.{label}.{renderer}"] = latency(best)
+                app.flasher.cancel_all()
+                if app.journal is not None:
+                    app.journal.close()
+                app.puzzle_pool.stop()
+                for child in root.winfo_children():
+                    child.destroy()
+        finally:
+            root.destroy()
+            if sudokuCode._storage is not None:
+                sudokuCode._storage.close()
+                sudokuCode._storage = None
+            sudokuCode.PUZZLE_POOL_DEPTH, sudokuCode.RATED_PUZZLES = saved
+            os.chdir(cwd)
+    return metrics, None
+
+
+def check(metrics, thresholds, baseline=None, tolerance=0.25, scale=1.0, baseline_scale=1.0):
+    # Returns a list of human-readable regressions. scale and baseline_scale
+    # are this machine's speed relative to the one the thresholds and the
+    # baseline come from: floors on rates are multiplied by them, ceilings on
+    # latencies divided.
+    failures = []
+    for name, limit in thresholds.items():
+        if name not in metrics:
+            continue
+        value = metrics[name]["value"]
+        if "min" in limit and value < limit["min"] * scale:
+            failures.append(f"{name}: {value:.1f} below the floor of {limit['min'] * scale:.1f}")
+        if "max" in limit and value > limit["max"] / scale:
+            failures.append(f"{name}: {value:.1f} above the ceiling of {limit['max'] / scale:.1f}")
+    for name, old in (baseline or {}).items():
+        if name not in metrics:
+            continue
+        value = metrics[name]["value"]
+        if old["better"] == "higher":
+            expected = old["value"] * baseline_scale
+            if value < expected * (1 - tolerance):
+                failures.append(f"{name}: {value:.1f} vs {expected:.1f} expected from the baseline")
+        if old["better"] == "lower":
+            expected = old["value"] / baseline_scale
+            if value > expected * (1 + tolerance):
+                failures.append(f"{name}: {value:.1f} vs {expected:.1f} expected from the baseline")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generation, solving and board building.")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="where to write the results")
+    parser.add_argument("--size", type=int, default=20, help="puzzles per generated corpus")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per metric; the best counts")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--no-ui", action="store_true", help="skip the widget benchmarks")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate(args.min_time, args.repeat)
+    corpora, metrics = make_corpora(args.size, args.seed)
+    metrics.update(bench_solvers(corpora, args.min_time, args.repeat))
+    skipped = {}
+    if args.no_ui:
+        skipped["ui"] = "disabled"
+    else:
+        ui_metrics, reason = bench_widgets(args.repeat)
+        metrics.update(ui_metrics)
+        if reason:
+            skipped["ui"] = reason
+
+    with open(args.thresholds, "r") as f:
+        thresholds = json.load(f)
+    baseline = None
+    baseline_scale = 1.0
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            old = json.load(f)
+        baseline = old["metrics"]
+        if old.get("calibration"):
+            baseline_scale = calibration / old["calibration"]
+    scale = calibration / thresholds["calibration"]
+    failures = check(metrics, thresholds["metrics"], baseline, args.tolerance, scale, baseline_scale)
+
+    report = {
+        "seed": args.seed,
+        "corpus_size": args.size,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "calibration": calibration,
+        "metrics": metrics,
+        "skipped": skipped,
+        "failures": failures,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+
+    print(f"{'calibration':<36}{calibration:>12.1f} loops/s, {scale:.2f}x the threshold machine")
+    for name, metric in metrics.items():
+        print(f"{name:<36}{metric['value']:>12.1f} {metric['unit']}")
+    for name, reason in skipped.items():
+        print(f"{name:<36}{'skipped':>12} {reason}")
+    for failure in failures:
+        print("REGRESSION", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
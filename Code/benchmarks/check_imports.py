@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Checks that the engine package stays headless and cheap to import: every
+# module is imported in a fresh interpreter, must not pull in tkinter or PIL,
+# and must load within the time budget. Exits with status 1 on a failure.
+# Run from the Code directory:  python benchmarks/check_imports.py [budget_ms]
+# tests/test_imports.py runs the same probe under pytest. batch and audit
+# need NumPy and are left out.
+
+import json
+import os
+import subprocess
+import sys
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODULES = (
+    "nexus_sudoku",
+    "nexus_sudoku.board",
+    "nexus_sudoku.solver",
+    "nexus_sudoku.dlx",
+    "nexus_sudoku.generator",
+    "nexus_sudoku.rating",
+    "nexus_sudoku.sudoku",
+    "nexus_sudoku.model",
+    "nexus_sudoku.hints",
+    "nexus_sudoku.history",
+    "nexus_sudoku.clock",
+    "nexus_sudoku.scoring",
+    "nexus_sudoku.storage",
+    "nexus_sudoku.journal",
+    "nexus_sudoku.pool",
+    "nexus_sudoku.bank",
+    "nexus_sudoku.generate",
+    "nexus_sudoku.instrument",
+)
+GUI_MODULES = ("tkinter", "_tkinter", "PIL")
+DEFAULT_BUDGET_MS = 150
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+took = time.perf_counter() - start
+gui = sorted(m for m in sys.modules if m.split(".")[0] in {gui!r})
+print(json.dumps({{"ms": took * 1000, "gui": gui}}))
+"""
+
+
+def probe(module):
+    code = PROBE.format(module=module, gui=GUI_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=CODE_DIR, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    failed = False
+    print(f"{'module':<26}{'import':>10}  status")
+    for module in MODULES:
+        result = probe(module)
+        problems = []
+        if result["gui"]:
+            problems.append("imports " + ", ".join(result["gui"]))
+        if result["ms"] > budget:
+            problems.append(f"over the {budget:.0f} ms budget")
+        failed |= bool(problems)
+        print(f"{module:<26}{result['ms']:>8.1f}ms  {'; '.join(problems) or 'ok'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
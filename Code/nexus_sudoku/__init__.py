@@ -0,0 +1,8 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from .board import Board
+from .solver import BitmaskSolver, solve_board
+from .dlx import DLXSolver
+from .sudoku import Sudoku
+from .model import GameModel
+from .scoring import score
@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Offline re-scoring of the game history. Rows are read from the games table
+# in chunks and each chunk is scored in one vectorized pass with the rules of
+# scoring.score, or with changed rules to preview what a rule change would
+# do. Games whose stored score does not follow from their time, hints and
+# mistakes, and high scores that no recorded game can account for, are
+# reported as suspect. Games on a difficulty the rules do not know are listed
+# rather than scored, and high scores imported from the old JSON files, which
+# no recorded game backs up, are counted apart. The database is opened read
+# only. Requires NumPy, which the rest of the package does not.
+#
+#   python -m nexus_sudoku.audit nexus_sudoku.db --highscores highscores.json
+
+import argparse
+import json
+import sqlite3
+import sys
+
+import numpy as np
+
+from .scoring import BASE_SCORE, DIFFICULTY_BONUS, HINT_PENALTY, MISTAKE_PENALTY
+from .storage import Storage
+
+DEFAULT_CHUNK = 1 << 18
+
+
+def score_many(difficulty, elapsed, hints, mistakes, base=BASE_SCORE, bonus=None,
+               hint_penalty=HINT_PENALTY, mistake_penalty=MISTAKE_PENALTY):
+    # Array version of scoring.score: difficulty is a sequence of names, the
+    # rest numeric sequences of the same length. Returns int64 scores, with
+    # -1 for difficulties that have no bonus.
+    bonus = DIFFICULTY_BONUS if bonus is None else bonus
+    names, inverse = np.unique(np.asarray(difficulty, dtype=str), return_inverse=True)
+    known = np.array([str(name) in bonus for name in names], dtype=bool)[inverse.reshape(-1)]
+    bonus_of = np.array([bonus.get(str(name), 0) for name in names], dtype=np.int64)
+    points = (base + bonus_of[inverse.reshape(-1)]
+              - np.asarray(elapsed, dtype=np.float64).astype(np.int64)
+              - hint_penalty * np.asarray(hints, dtype=np.int64)
+              - mistake_penalty * np.asarray(mistakes, dtype=np.int64))
+    return np.where(known, np.maximum(points, 0), -1)
+
+
+def rescore(storage, chunk=DEFAULT_CHUNK, **rules):
+    # Yields (ids, usernames, difficulties, stored, rescored) per chunk.
+    cur = storage.db.execute("SELECT id, username, difficulty, score, elapsed, hints, mistakes FROM games")
+    while True:
+        rows = cur.fetchmany(chunk)
+        if not rows:
+            return
+        ids, users, difficulty, stored, elapsed, hints, mistakes = zip(*rows)
+        yield (np.array(ids, dtype=np.int64), np.array(users, dtype=str), np.array(difficulty, dtype=str),
+               np.array(stored, dtype=np.int64), score_many(difficulty, elapsed, hints, mistakes, **rules))
+
+
+def audit_games(storage, chunk=DEFAULT_CHUNK, **rules):
+    # Returns (games checked, [(id, stored, rescored)] that disagree, the
+    # best rescored game per (username, difficulty), [(id, difficulty)] of
+    # games on an unknown difficulty).
+    checked = 0
+    mismatched = []
+    best = {}
+    unknown = []
+    for ids, users, difficulty, stored, new in rescore(storage, chunk, **rules):
+        odd = np.nonzero(new < 0)[0]
+        if len(odd):
+            unknown.extend(zip(ids[odd].tolist(), difficulty[odd].tolist()))
+            keep = new >= 0
+            ids, users, difficulty, stored, new = ids[keep], users[keep], difficulty[keep], stored[keep], new[keep]
+        checked += len(ids)
+        if not len(ids):
+            continue
+        bad = np.nonzero(stored != new)[0]
+        mismatched.extend(zip(ids[bad].tolist(), stored[bad].tolist(), new[bad].tolist()))
+        user_names, user_of = np.unique(users, return_inverse=True)
+        level_names, level_of = np.unique(difficulty, return_inverse=True)
+        top = np.full((len(user_names), len(level_names)), -1, dtype=np.int64)
+        np.maximum.at(top, (user_of.reshape(-1), level_of.reshape(-1)), new)
+        for u, d in zip(*np.nonzero(top >= 0)):
+            key = (str(user_names[u]), str(level_names[d]))
+            best[key] = max(best.get(key, -1), int(top[u, d]))
+    return checked, mismatched, best, unknown
+
+
+def audit_highscores(highscores, best, base=BASE_SCORE, bonus=None, imported=()):
+    # highscores is {username: {difficulty: score}} (highscores.json or the
+    # highscores table). Returns [(username, difficulty, claimed, reason)],
+    # with difficulty None when a user's whole entry is not a dict. Scores
+    # that are not non-negative integers are reported as malformed, as a
+    # tampered file may hold anything. imported holds (username, difficulty)
+    # keys carried over from the JSON files: no game backs them up, so only
+    # the maximum score is checked.
+    bonus = DIFFICULTY_BONUS if bonus is None else bonus
+    suspect = []
+    for username, by_difficulty in highscores.items():
+        if not isinstance(by_difficulty, dict):
+            suspect.append((username, None, by_difficulty, "malformed entry"))
+            continue
+        for difficulty, claimed in by_difficulty.items():
+            if type(claimed) is not int or claimed < 0:
+                suspect.append((username, difficulty, claimed, "malformed entry"))
+                continue
+            if not claimed:
+                continue
+            top = best.get((username, difficulty))
+            if difficulty not in bonus or claimed > base + bonus[difficulty]:
+                reason = "above the maximum possible score"
+            elif (username, difficulty) in imported:
+                continue
+            elif top is None:
+                reason = "no recorded game"
+            elif claimed > top:
+                reason = f"best recorded game scores {top}"
+            else:
+                continue
+            suspect.append((username, difficulty, claimed, reason))
+    return suspect
+
+
+def stored_highscores(storage):
+    highscores = {}
+    for username, difficulty, score in storage.db.execute("SELECT username, difficulty, score FROM highscores"):
+        highscores.setdefault(username, {})[difficulty] = score
+    return highscores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m nexus_sudoku.audit",
+                                     description="Re-score recorded games and check high scores against them.")
+    parser.add_argument("database", help="SQLite database written by the game")
+    parser.add_argument("--highscores", help="highscores.json to check instead of the database's high scores")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="games scored per vectorized pass")
+    parser.add_argument("--base", type=int, default=BASE_SCORE, help="base score to rescore with")
+    parser.add_argument("--hint-penalty", type=int, default=HINT_PENALTY)
+    parser.add_argument("--mistake-penalty", type=int, default=MISTAKE_PENALTY)
+    parser.add_argument("--limit", type=int, default=20, help="suspect entries to list")
+    args = parser.parse_args(argv)
+    rules = dict(base=args.base, hint_penalty=args.hint_penalty, mistake_penalty=args.mistake_penalty)
+
+    imported = set()
+    try:
+        with Storage(args.database, readonly=True) as storage:
+            checked, mismatched, best, unknown = audit_games(storage, args.chunk, **rules)
+            if args.highscores:
+                with open(args.highscores, "r") as f:
+                    highscores = json.load(f)
+                if not isinstance(highscores, dict):
+                    raise ValueError(f"{args.highscores} does not hold a high score table")
+            else:
+                highscores = stored_highscores(storage)
+                imported = storage.imported_highscores()
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Cannot audit {args.database}: {e}", file=sys.stderr)
+        return 2
+    suspect = audit_highscores(highscores, best, args.base, imported=imported)
+
+    print(f"{checked} games rescored, {len(mismatched)} with a different score")
+    for game_id, stored, new in mismatched[:args.limit]:
+        print(f"  game {game_id}: stored {stored}, rescored {new}")
+    if unknown:
+        print(f"{len(unknown)} games on an unknown difficulty, not scored")
+        for game_id, difficulty in unknown[:args.limit]:
+            print(f"  game {game_id}: {difficulty!r}")
+    print(f"{len(suspect)} suspect high scores")
+    for username, difficulty, claimed, reason in suspect[:args.limit]:
+        where = username if difficulty is None else f"{username} ({difficulty})"
+        print(f"  {where}: {claimed!r}, {reason}")
+    if imported:
+        print(f"{len(imported)} high scores imported from the JSON files, with no recorded game to check")
+    return 1 if mismatched or unknown or suspect else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
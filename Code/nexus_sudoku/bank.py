@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Packed, memory-mapped puzzle banks.
+#
+# Layout (little endian):
+#   header   magic "NXSB", u16 version, u16 record size, u32 record count,
+#            u32 data offset, u16 index entries
+#   index    per difficulty: 8-byte name, u32 first record, u32 record count
+#   records  41 bytes of givens and 41 bytes of solution, two cells per byte
+#            (high nibble first), then u8 difficulty index and u8 level
+#            (0 when unrated)
+# Records are grouped by difficulty, so record k lives at
+# data_offset + k * RECORD_SIZE and a difficulty is a contiguous range.
+#
+# Convert generator output with:
+#   python -m nexus_sudoku.bank hard.jsonl puzzles.bank
+
+import json
+import mmap
+import random
+import struct
+import sys
+
+from .grid import unflatten
+
+MAGIC = b"NXSB"
+VERSION = 1
+GRID_BYTES = 41
+RECORD_SIZE = 2 * GRID_BYTES + 2
+HEADER = struct.Struct("<4sHHIIH")
+INDEX_ENTRY = struct.Struct("<8sII")
+
+_NIBBLES = tuple((b >> 4, b & 0x0F) for b in range(256))
+
+
+def pack_cells(cells):
+    cells = list(cells) + [0]
+    return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_cells(data):
+    cells = []
+    for b in data:
+        cells.extend(_NIBBLES[b])
+    del cells[81:]
+    return cells
+
+
+def write_bank(path, records):
+    # records: iterable of (puzzle, solution, difficulty, level) with the
+    # grids as flat 81-cell sequences.
+    groups = {}
+    for puzzle, solution, difficulty, level in records:
+        groups.setdefault(difficulty, []).append((puzzle, solution, level))
+    names = list(groups)
+    for name in names:
+        if len(name.encode("ascii")) > INDEX_ENTRY.size - 8:
+            raise ValueError(f"difficulty name {name!r} is longer than {INDEX_ENTRY.size - 8} bytes")
+    data_offset = HEADER.size + INDEX_ENTRY.size * len(names)
+    count = sum(len(g) for g in groups.values())
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, data_offset, len(names)))
+        first = 0
+        for name in names:
+            f.write(INDEX_ENTRY.pack(name.encode("ascii"), first, len(groups[name])))
+            first += len(groups[name])
+        for code, name in enumerate(names):
+            for puzzle, solution, level in groups[name]:
+                f.write(pack_cells(puzzle))
+                f.write(pack_cells(solution))
+                f.write(bytes((code, level)))
+    return count
+
+
+def convert_jsonl(jsonl_path, bank_path):
+    def records():
+        with open(jsonl_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                yield ([int(ch) for ch in rec["puzzle"]], [int(ch) for ch in rec["solution"]],
+                       rec["difficulty"], rec.get("level", 0))
+    return write_bank(bank_path, records())
+
+
+class PuzzleBank:
+    def __init__(self, path):
+        self._map = None
+        self._file = open(path, "rb")
+        try:
+            self._open(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path):
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{path} is empty")
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bank")
+        magic, version, record_size, count, data_offset, entries = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {VERSION} puzzle bank")
+        if data_offset < HEADER.size + entries * INDEX_ENTRY.size or data_offset + count * RECORD_SIZE > len(self._map):
+            raise ValueError(f"{path} is truncated")
+        self.count = count
+        self.data_offset = data_offset
+        self.names = []
+        self.ranges = {}
+        for i in range(entries):
+            name, first, n = INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)
+            name = name.rstrip(b"\0").decode("ascii")
+            self.names.append(name)
+            self.ranges[name] = (first, n)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def get(self, k):
+        # Returns (puzzle, solution, difficulty, level) for record k.
+        if not 0 <= k < self.count:
+            raise IndexError(k)
+        start = self.data_offset + k * RECORD_SIZE
+        record = self._map[start:start + RECORD_SIZE]
+        puzzle = unflatten(unpack_cells(record[:GRID_BYTES]))
+        solution = unflatten(unpack_cells(record[GRID_BYTES:2 * GRID_BYTES]))
+        return puzzle, solution, self.names[record[-2]], record[-1]
+
+    def count_for(self, difficulty):
+        return self.ranges.get(difficulty, (0, 0))[1]
+
+    def get_for(self, difficulty, i):
+        first, n = self.ranges[difficulty]
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return self.get(first + i)
+
+    def random(self, difficulty, rng=random):
+        first, n = self.ranges[difficulty]
+        return self.get(first + rng.randrange(n))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: python -m nexus_sudoku.bank INPUT.jsonl OUTPUT.bank", file=sys.stderr)
+        return 2
+    count = convert_jsonl(argv[0], argv[1])
+    print(f"Wrote {count} puzzles to {argv[1]}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
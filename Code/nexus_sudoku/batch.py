@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Vectorized checks over many grids at once. Grids are an (N, 9, 9) uint8
+# array with 0 for empty cells. Per-unit digit counts are kept packed in one
+# uint64 per unit, four bits per digit (a unit has at most 9 of a digit, so a
+# nibble never overflows), which turns row/column/box counting into plain
+# integer sums and duplicate/single detection into a few bit operations.
+# Work is done in chunks so memory stays bounded for millions of grids.
+# Requires NumPy, which the rest of the package does not.
+
+import numpy as np
+
+from .grid import DIGIT_OF
+
+DEFAULT_CHUNK = 8192
+
+NIBBLE_LOW = np.uint64(0x111111111)
+# NIBBLE[d]: one count in the nibble of digit d (digit 0 counts nothing)
+NIBBLE = np.array([0] + [1 << 4 * (d - 1) for d in range(1, 10)], dtype=np.uint64)
+# SPREAD[m]: the candidate mask m (bits 1..9) with each bit moved to its nibble
+SPREAD = np.array([sum(1 << 4 * (d - 1) for d in range(1, 10) if m >> d & 1) for m in range(1024)],
+                  dtype=np.uint64)
+SINGLE_DIGIT = np.array(DIGIT_OF, dtype=np.uint8)
+DIGIT_BIT = np.array([0] + [1 << d for d in range(1, 10)], dtype=np.uint16)
+ALL_DIGITS = np.uint16(0x3FE)
+
+
+def as_grids(boards):
+    # Accepts an array-like of 9x9 grids, flat 81-cell rows or Board objects.
+    if not isinstance(boards, np.ndarray):
+        boards = list(boards)
+        if boards and hasattr(boards[0], "cells"):
+            boards = np.frombuffer(b"".join(bytes(b.cells) for b in boards), dtype=np.uint8)
+    grids = np.asarray(boards, dtype=np.uint8).reshape(-1, 9, 9)
+    if grids.size and grids.max() > 9:
+        raise ValueError("grid values must be between 0 and 9")
+    return grids
+
+
+def _unit_sums(packed):
+    # (N, 9, 9) uint64 -> per-cell broadcastable row, column and box sums
+    n = len(packed)
+    rows = packed.sum(axis=2, dtype=np.uint64)[:, :, None]
+    cols = packed.sum(axis=1, dtype=np.uint64)[:, None, :]
+    boxes = packed.reshape(n, 3, 3, 3, 3).sum(axis=(2, 4), dtype=np.uint64)
+    boxes = boxes.repeat(3, axis=1).repeat(3, axis=2)
+    return rows, cols, boxes
+
+
+def _more_than_one(x):
+    return ((x >> np.uint64(1)) | (x >> np.uint64(2)) | (x >> np.uint64(3))) & NIBBLE_LOW
+
+
+def _exactly_one(x):
+    return x & ~((x >> np.uint64(1)) | (x >> np.uint64(2)) | (x >> np.uint64(3))) & NIBBLE_LOW
+
+
+def _validate_chunk(grids):
+    packed = NIBBLE[grids]
+    rows, cols, boxes = _unit_sums(packed)
+    dup = _more_than_one(rows) | _more_than_one(cols) | _more_than_one(boxes)
+    conflicts = (packed & dup) != 0
+    valid = ~conflicts.any(axis=(1, 2))
+    complete = valid & (grids != 0).all(axis=(1, 2))
+    return valid, conflicts, complete
+
+
+def validate(grids, chunk=DEFAULT_CHUNK):
+    # Returns (valid, conflicts, complete):
+    #   valid     (N,) no digit repeats in any row, column or box
+    #   conflicts (N, 9, 9) cells holding a repeated digit
+    #   complete  (N,) valid and fully filled
+    grids = as_grids(grids)
+    n = len(grids)
+    valid = np.empty(n, dtype=bool)
+    conflicts = np.empty((n, 9, 9), dtype=bool)
+    complete = np.empty(n, dtype=bool)
+    for start in range(0, n, chunk):
+        stop = start + chunk
+        valid[start:stop], conflicts[start:stop], complete[start:stop] = _validate_chunk(grids[start:stop])
+    return valid, conflicts, complete
+
+
+def _used_masks(grids):
+    bits = DIGIT_BIT[grids]
+    n = len(grids)
+    rows = np.bitwise_or.reduce(bits, axis=2)[:, :, None]
+    cols = np.bitwise_or.reduce(bits, axis=1)[:, None, :]
+    boxes = np.bitwise_or.reduce(bits.reshape(n, 3, 3, 3, 3), axis=(2, 4))
+    boxes = boxes.repeat(3, axis=1).repeat(3, axis=2)
+    return rows | cols | boxes
+
+
+def _singles_step(grids):
+    # One round of naked and hidden singles on every grid; returns the
+    # digits to place (0 where nothing is forced).
+    cand = np.where(grids == 0, ALL_DIGITS & ~_used_masks(grids), 0).astype(np.uint16)
+    placed = SINGLE_DIGIT[cand]
+    spread = SPREAD[cand]
+    rows, cols, boxes = _unit_sums(spread)
+    hidden = spread & (_exactly_one(rows) | _exactly_one(cols) | _exactly_one(boxes))
+    for d in range(1, 10):
+        hit = ((hidden >> np.uint64(4 * (d - 1))) & np.uint64(1)) != 0
+        placed = np.where((placed == 0) & hit, np.uint8(d), placed)
+    return placed
+
+
+def _solve_singles_chunk(grids, max_rounds):
+    active = np.arange(len(grids))
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        placed = _singles_step(grids[active])
+        progress = placed.any(axis=(1, 2))
+        active = active[progress]
+        grids[active] += placed[progress]
+    return grids
+
+
+def solve_singles(grids, max_rounds=81, chunk=DEFAULT_CHUNK):
+    # Repeatedly fills every naked and hidden single across the batch. Grids
+    # that need guessing are returned partially filled. Returns
+    # (grids, solved) where solved marks grids that ended complete and valid.
+    grids = as_grids(grids).copy()
+    for start in range(0, len(grids), chunk):
+        stop = start + chunk
+        grids[start:stop] = _solve_singles_chunk(grids[start:stop], max_rounds)
+    valid, conflicts, complete = validate(grids, chunk)
+    return grids, complete
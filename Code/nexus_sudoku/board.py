@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from .grid import ROWS, COLS, BOXES
+
+
+class Board:
+    # A 9x9 grid held in one flat 81-byte bytearray (row-major, 0 = empty).
+    # board[r] returns a writable memoryview of row r, so code written for
+    # nested lists (board[r][c], board[r][c] = v) keeps working, while
+    # board[r, c] and board.cells[idx] avoid the intermediate view. Copying
+    # is a single 81-byte memcpy. Boards hash by content; do not mutate a
+    # board while it is used as a dict key or set member.
+    __slots__ = ("cells",)
+
+    def __init__(self, cells=None):
+        self.cells = bytearray(81) if cells is None else bytearray(cells)
+        if len(self.cells) != 81:
+            raise ValueError("a board has exactly 81 cells")
+
+    @classmethod
+    def from_lists(cls, board):
+        if isinstance(board, Board):
+            return board.copy()
+        return cls(v for row in board for v in row)
+
+    @classmethod
+    def from_string(cls, text):
+        return cls(int(ch) for ch in text.replace(".", "0"))
+
+    def to_lists(self):
+        cells = self.cells
+        return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+    def to_string(self):
+        return "".join(map(str, self.cells))
+
+    def copy(self):
+        return Board(self.cells)
+
+    def row(self, r):
+        return bytes(self.cells[r * 9:r * 9 + 9])
+
+    def col(self, c):
+        return bytes(self.cells[c::9])
+
+    def box(self, b):
+        cells = self.cells
+        return bytes(cells[idx] for idx in BOXES[b])
+
+    def units(self):
+        cells = self.cells
+        return [bytes(cells[idx] for idx in unit) for unit in ROWS + COLS + BOXES]
+
+    def clues(self):
+        return 81 - self.cells.count(0)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, tuple):
+            r, c = pos
+            return self.cells[r * 9 + c]
+        return memoryview(self.cells)[pos * 9:pos * 9 + 9]
+
+    def __setitem__(self, pos, value):
+        r, c = pos
+        self.cells[r * 9 + c] = value
+
+    def __iter__(self):
+        view = memoryview(self.cells)
+        return (view[r * 9:r * 9 + 9] for r in range(9))
+
+    def __len__(self):
+        return 9
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(bytes(self.cells))
+
+    def __repr__(self):
+        return f"Board({self.to_string()!r})"
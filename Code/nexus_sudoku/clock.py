@@ -0,0 +1,45 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import time
+
+
+class GameClock:
+    # Play time measured on a monotonic clock, so wall-clock jumps (NTP,
+    # manual changes, suspend adjustments) never leak into scores. Time is
+    # kept as closed running segments plus the open one, if any; pausing
+    # closes the open segment and nothing else is ever patched by hand.
+    def __init__(self, now=time.monotonic):
+        self.now = now
+        self.reset()
+
+    def reset(self, elapsed=0.0):
+        # elapsed carries time over from an earlier run (a resumed game)
+        self.segments = []
+        self.closed_total = elapsed
+        self.started_at = None
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def start(self):
+        if self.started_at is None:
+            self.started_at = self.now()
+
+    resume = start
+
+    def pause(self):
+        if self.started_at is not None:
+            end = self.now()
+            self.segments.append((self.started_at, end))
+            self.closed_total += end - self.started_at
+            self.started_at = None
+
+    def restart(self, elapsed=0.0):
+        self.reset(elapsed)
+        self.start()
+
+    def elapsed(self):
+        if self.started_at is None:
+            return self.closed_total
+        return self.closed_total + self.now() - self.started_at
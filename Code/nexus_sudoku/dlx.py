@@ -0,0 +1,216 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+# Knuth's Algorithm X with dancing links over the 324 Sudoku constraints:
+# every cell holds one digit, and every row, column and box holds each digit
+# once. Each of the 729 (cell, digit) choices is a matrix row covering exactly
+# four of those constraints. The links live in flat integer lists: node 0 is
+# the root, nodes 1..324 are column headers and row r owns the four nodes
+# starting at FIRST_NODE + 4 * r. The full matrix is built once, on first
+# use, and each solver only copies the lists, which is much cheaper than
+# rebuilding it.
+
+import functools
+
+from . import instrument
+from .grid import ROW_OF, COL_OF, BOX_OF, flatten, unflatten
+
+NUM_COLUMNS = 324
+FIRST_NODE = NUM_COLUMNS + 1
+
+
+@functools.lru_cache(maxsize=None)
+def _build_matrix():
+    left = [i - 1 for i in range(FIRST_NODE)]
+    right = [i + 1 for i in range(FIRST_NODE)]
+    up = list(range(FIRST_NODE))
+    down = list(range(FIRST_NODE))
+    column = list(range(FIRST_NODE))
+    size = [0] * FIRST_NODE
+    left[0] = NUM_COLUMNS
+    right[NUM_COLUMNS] = 0
+    for r in range(729):
+        idx, d = divmod(r, 9)
+        cols = (
+            1 + idx,
+            82 + ROW_OF[idx] * 9 + d,
+            163 + COL_OF[idx] * 9 + d,
+            244 + BOX_OF[idx] * 9 + d,
+        )
+        first = len(left)
+        for k, col in enumerate(cols):
+            node = first + k
+            left.append(first + (k - 1) % 4)
+            right.append(first + (k + 1) % 4)
+            up.append(up[col])
+            down.append(col)
+            column.append(col)
+            down[up[col]] = node
+            up[col] = node
+            size[col] += 1
+    return left, right, up, down, column, size
+
+
+class DLXSolver:
+    def __init__(self, board):
+        self.givens = flatten(board)
+        left, right, up, down, column, size = _build_matrix()
+        self.left = left[:]
+        self.right = right[:]
+        self.up = up[:]
+        self.down = down[:]
+        self.column = column
+        self.size = size[:]
+        self.nodes = 0
+        self.consistent = True
+        covered = [False] * FIRST_NODE
+        for idx, v in enumerate(self.givens):
+            if not v:
+                continue
+            node = FIRST_NODE + 4 * (idx * 9 + v - 1)
+            for k in range(4):
+                col = column[node + k]
+                if covered[col]:
+                    self.consistent = False
+                    return
+                covered[col] = True
+                self._cover(col)
+
+    def _cover(self, c):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def _choose_column(self):
+        right, size = self.right, self.size
+        c = right[0]
+        best, best_size = c, size[c]
+        while c != 0 and best_size > 1:
+            if size[c] < best_size:
+                best, best_size = c, size[c]
+            c = right[c]
+        return best, best_size
+
+    def _solution(self, chosen):
+        cells = self.givens[:]
+        for node in chosen:
+            idx, d = divmod((node - FIRST_NODE) // 4, 9)
+            cells[idx] = d + 1
+        return unflatten(cells)
+
+    def iter_solutions(self):
+        if not self.consistent:
+            return
+        chosen = []
+        yield from self._iter(chosen)
+
+    def _iter(self, chosen):
+        if self.right[0] == 0:
+            yield self._solution(chosen)
+            return
+        c, n = self._choose_column()
+        if n == 0:
+            return
+        right, left, down, column = self.right, self.left, self.down, self.column
+        self._cover(c)
+        try:
+            r = down[c]
+            while r != c:
+                self.nodes += 1
+                chosen.append(r)
+                j = right[r]
+                while j != r:
+                    self._cover(column[j])
+                    j = right[j]
+                try:
+                    yield from self._iter(chosen)
+                finally:
+                    # Runs on close() too, so an abandoned iterator still
+                    # leaves the links intact for the next query.
+                    j = left[r]
+                    while j != r:
+                        self._uncover(column[j])
+                        j = left[j]
+                    chosen.pop()
+                r = down[r]
+        finally:
+            self._uncover(c)
+
+    def count_solutions(self, limit=None):
+        if not self.consistent:
+            return 0
+        self._found = 0
+        self._limit = limit
+        self._count()
+        return self._found
+
+    def _count(self):
+        right, left, down, column = self.right, self.left, self.down, self.column
+        if right[0] == 0:
+            self._found += 1
+            return self._limit is not None and self._found >= self._limit
+        c, n = self._choose_column()
+        if n == 0:
+            return False
+        self._cover(c)
+        done = False
+        r = down[c]
+        while r != c and not done:
+            self.nodes += 1
+            j = right[r]
+            while j != r:
+                self._cover(column[j])
+                j = right[j]
+            done = self._count()
+            j = left[r]
+            while j != r:
+                self._uncover(column[j])
+                j = left[j]
+            r = down[r]
+        self._uncover(c)
+        return done
+
+    def solve(self):
+        solutions = self.iter_solutions()
+        solution = next(solutions, None)
+        solutions.close()
+        return solution
+
+
+def solve(board):
+    return DLXSolver(board).solve()
+
+
+def count_solutions(board, limit=None):
+    solver = DLXSolver(board)
+    found = solver.count_solutions(limit)
+    if instrument.ENABLED:
+        instrument.count("dlx.count_calls")
+        instrument.observe("dlx.nodes", solver.nodes)
+    return found
+
+
+def iter_solutions(board):
+    return DLXSolver(board).iter_solutions()
@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Headless bulk puzzle generation. Run from the Code directory, e.g.
+#   python -m nexus_sudoku.generate --difficulty hard --count 100000 --workers 8
+# Work is split into fixed-size chunks and chunk i is always generated from
+# seed (base seed, i), so the same arguments produce the same puzzles no
+# matter how many workers run or in which order chunks complete.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .generator import DIFFICULTY_CLUES, DIFFICULTY_LEVELS, FullBoardGenerator, make_rated_puzzle, make_unique_puzzle
+from .grid import to_string
+from .rating import rate
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+def chunk_seed(base_seed, index):
+    return base_seed * 1_000_003 + index
+
+
+def generate_chunk(difficulty, base_seed, index, count, rated=False):
+    rng = random.Random(chunk_seed(base_seed, index))
+    generator = FullBoardGenerator(rng)
+    clues = DIFFICULTY_CLUES[difficulty]
+    low, high = DIFFICULTY_LEVELS[difficulty]
+    records = []
+    for _ in range(count):
+        if rated:
+            # make_rated_puzzle settles for its closest puzzle after
+            # MAX_RATED_BOARDS; a rated pack only keeps puzzles in the band.
+            attempts = 0
+            while True:
+                puzzle, solution, boards, level = make_rated_puzzle(generator, difficulty)
+                attempts += boards
+                if low <= level <= high:
+                    break
+        else:
+            solution = generator.generate()
+            puzzle, attempts = make_unique_puzzle(solution, clues, rng)
+            level = rate(puzzle)
+        records.append({
+            "puzzle": to_string(puzzle),
+            "solution": to_string(solution),
+            "difficulty": difficulty,
+            "level": level,
+            "attempts": attempts,
+        })
+    return index, records
+
+
+def _chunks(count, chunk_size):
+    index = 0
+    while count > 0:
+        size = min(chunk_size, count)
+        yield index, size
+        index += 1
+        count -= size
+
+
+def _write(out, index, records):
+    for record in records:
+        record["chunk"] = index
+        out.write(json.dumps(record))
+        out.write("\n")
+
+
+def run(difficulty, count, workers, seed, out, chunk_size=DEFAULT_CHUNK_SIZE, rated=False):
+    chunks = _chunks(count, chunk_size)
+    done = 0
+    if workers <= 1:
+        for index, size in chunks:
+            _write(out, *generate_chunk(difficulty, seed, index, size, rated))
+            done += size
+        return done
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of chunks in flight so huge counts do not
+        # queue every task up front; results are written as they complete.
+        pending = set()
+        for index, size in chunks:
+            pending.add(pool.submit(generate_chunk, difficulty, seed, index, size, rated))
+            if len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, records = future.result()
+                    _write(out, index, records)
+                    done += len(records)
+        for future in pending:
+            index, records = future.result()
+            _write(out, index, records)
+            done += len(records)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m nexus_sudoku.generate",
+                                     description="Generate Sudoku puzzles with a unique solution.")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_CLUES), default="medium")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--rated", action="store_true",
+                        help="only keep puzzles whose technique level matches the difficulty")
+    parser.add_argument("--output", "-o", default="-",
+                        help="JSON-lines output file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.output == "-":
+        done = run(args.difficulty, args.count, args.workers, args.seed, sys.stdout, args.chunk_size, args.rated)
+    else:
+        with open(args.output, "w") as out:
+            done = run(args.difficulty, args.count, args.workers, args.seed, out, args.chunk_size, args.rated)
+    took = time.perf_counter() - start
+    print(f"Generated {done} {args.difficulty} puzzles in {took:.1f}s "
+          f"({done / took:.1f}/s, {args.workers} workers)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import random
+
+from . import instrument
+from .board import Board
+from .dlx import count_solutions
+from .grid import ALL_DIGITS, ROW_OF, COL_OF, BOX_OF, DIGITS_OF, flatten, unflatten
+from .rating import rate
+
+DIFFICULTY_CLUES = {
+    "easy": 36,
+    "medium": 32,
+    "hard": 28
+}
+# Technique levels (see rating.LEVEL_NAMES) accepted for each difficulty.
+DIFFICULTY_LEVELS = {
+    "easy": (1, 1),
+    "medium": (2, 2),
+    "hard": (3, 7)
+}
+MAX_PUZZLE_ATTEMPTS = 20
+MAX_RATED_BOARDS = 60
+
+# The usual shifted-row pattern; every relabelling, band/stack shuffle and
+# transpose of it is again a valid solved grid.
+CANONICAL_BOARD = tuple(tuple((3 * (r % 3) + r // 3 + c) % 9 + 1 for c in range(9)) for r in range(9))
+
+
+class FullBoardGenerator:
+    # Fills the grid cell by cell with an explicit stack instead of recursion.
+    # options[pos] holds the digits not yet tried at depth pos, so all state
+    # lives in lists allocated once and reused by every generate() call.
+    # backtracks counts the dead ends hit by the last call.
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.backtracks = 0
+        self.cells = [0] * 81
+        self.options = [0] * 81
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+
+    @instrument.timed("generator.full_board")
+    def generate(self):
+        cells, options, rows, cols, boxes = self.cells, self.options, self.rows, self.cols, self.boxes
+        backtracks = 0
+        choice = self.rng.choice
+        for i in range(81):
+            cells[i] = 0
+        for i in range(9):
+            rows[i] = cols[i] = boxes[i] = 0
+        pos = 0
+        options[0] = ALL_DIGITS
+        while pos < 81:
+            r, c, b = ROW_OF[pos], COL_OF[pos], BOX_OF[pos]
+            d = cells[pos]
+            if d:
+                bit = 1 << d
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+                cells[pos] = 0
+            m = options[pos]
+            if not m:
+                pos -= 1
+                backtracks += 1
+                continue
+            d = choice(DIGITS_OF[m])
+            bit = 1 << d
+            options[pos] = m ^ bit
+            cells[pos] = d
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            pos += 1
+            if pos < 81:
+                options[pos] = ALL_DIGITS & ~(rows[ROW_OF[pos]] | cols[COL_OF[pos]] | boxes[BOX_OF[pos]])
+        self.backtracks = backtracks
+        if instrument.ENABLED:
+            instrument.observe("generator.backtracks", backtracks)
+        return unflatten(cells)
+
+    def generate_board(self):
+        self.generate()
+        return Board(self.cells)
+
+    def generate_transformed(self, seed=CANONICAL_BOARD):
+        return transform_board(seed, self.rng)
+
+
+def _shuffled_lines(rng):
+    bands = [0, 1, 2]
+    rng.shuffle(bands)
+    order = []
+    for band in bands:
+        lines = [3 * band, 3 * band + 1, 3 * band + 2]
+        rng.shuffle(lines)
+        order.extend(lines)
+    return order
+
+
+def transform_board(board, rng=random):
+    # Applies a random validity-preserving symmetry: digit relabelling, row
+    # and column shuffles within bands/stacks, band/stack shuffles and an
+    # optional transpose.
+    digits = list(range(1, 10))
+    rng.shuffle(digits)
+    relabel = [0] + digits
+    row_order = _shuffled_lines(rng)
+    col_order = _shuffled_lines(rng)
+    if rng.random() < 0.5:
+        return [[relabel[board[r][c]] for r in row_order] for c in col_order]
+    return [[relabel[board[r][c]] for c in col_order] for r in row_order]
+
+
+def generate_full_board(rng=random, transformed=False):
+    generator = FullBoardGenerator(rng)
+    if transformed:
+        return generator.generate_transformed()
+    return generator.generate()
+
+
+@instrument.timed("generator.unique_puzzle")
+def make_unique_puzzle(full_board, clues, rng=random, max_attempts=MAX_PUZZLE_ATTEMPTS):
+    # Blanks cells of a solved board in random order, keeping a removal only
+    # if the puzzle still has exactly one solution. A pass can get stuck above
+    # the clue target when every remaining given is needed for uniqueness, in
+    # which case a new order is tried. Returns (puzzle, attempts), the puzzle
+    # being a Board if full_board is one and a 9x9 list otherwise; if no pass
+    # reaches the target the puzzle with the fewest clues is returned.
+    solution = flatten(full_board)
+    best, best_clues = None, 82
+    attempts = 0
+    checks = 0
+    while attempts < max_attempts:
+        attempts += 1
+        puzzle = solution[:]
+        remaining = 81
+        cells = list(range(81))
+        rng.shuffle(cells)
+        for idx in cells:
+            if remaining <= clues:
+                break
+            v = puzzle[idx]
+            puzzle[idx] = 0
+            checks += 1
+            if count_solutions(puzzle, limit=2) == 1:
+                remaining -= 1
+            else:
+                puzzle[idx] = v
+        if remaining < best_clues:
+            best, best_clues = puzzle, remaining
+        if remaining <= clues:
+            break
+    if instrument.ENABLED:
+        instrument.observe("generator.attempts", attempts)
+        instrument.count("generator.uniqueness_checks", checks)
+    if isinstance(full_board, Board):
+        return Board(best), attempts
+    return unflatten(best), attempts
+
+
+@instrument.timed("generator.rated_puzzle")
+def make_rated_puzzle(generator, difficulty, max_boards=MAX_RATED_BOARDS, clues=None, levels=None):
+    # Generates unique puzzles at the difficulty's clue count until one rates
+    # inside its level band (DIFFICULTY_CLUES and DIFFICULTY_LEVELS unless
+    # given). Returns (puzzle, solution, attempts, level); after max_boards
+    # the closest rated puzzle is returned, so callers that need the band
+    # must check the level.
+    low, high = (DIFFICULTY_LEVELS[difficulty] if levels is None else levels)
+    clues = DIFFICULTY_CLUES[difficulty] if clues is None else clues
+    best, best_distance = None, None
+    boards = 0
+    while boards < max_boards:
+        boards += 1
+        solution = generator.generate()
+        puzzle, attempts = make_unique_puzzle(solution, clues, generator.rng)
+        level = rate(puzzle)
+        distance = low - level if level < low else max(0, level - high)
+        if best is None or distance < best_distance:
+            best, best_distance = (puzzle, solution, level), distance
+        if distance == 0:
+            break
+    puzzle, solution, level = best
+    if instrument.ENABLED:
+        instrument.observe("generator.rated_boards", boards)
+    return puzzle, solution, boards, level
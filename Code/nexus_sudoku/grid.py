@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+# Shared lookup tables for a 9x9 grid stored as 81 cells in row-major order.
+# Digit d is represented in candidate masks as bit (1 << d), so ALL_DIGITS
+# covers bits 1..9.
+
+ALL_DIGITS = 0x3FE
+
+ROW_OF = tuple(idx // 9 for idx in range(81))
+COL_OF = tuple(idx % 9 for idx in range(81))
+BOX_OF = tuple(3 * (idx // 27) + (idx % 9) // 3 for idx in range(81))
+
+ROWS = tuple(tuple(r * 9 + c for c in range(9)) for r in range(9))
+COLS = tuple(tuple(r * 9 + c for r in range(9)) for c in range(9))
+BOXES = tuple(
+    tuple((3 * (b // 3) + i) * 9 + 3 * (b % 3) + j for i in range(3) for j in range(3))
+    for b in range(9)
+)
+UNITS = ROWS + COLS + BOXES
+
+PEERS = tuple(
+    tuple(sorted(set(ROWS[ROW_OF[idx]] + COLS[COL_OF[idx]] + BOXES[BOX_OF[idx]]) - {idx}))
+    for idx in range(81)
+)
+
+# Number of set bits and digit value for every 10-bit candidate mask.
+POPCOUNT = tuple(bin(m).count("1") for m in range(1024))
+DIGIT_OF = tuple(m.bit_length() - 1 if m and not m & (m - 1) else 0 for m in range(1024))
+DIGITS_OF = tuple(tuple(d for d in range(1, 10) if m >> d & 1) for m in range(1024))
+
+
+def flatten(board):
+    # Accepts a Board, a flat 81-cell sequence or a 9x9 list of lists.
+    cells = getattr(board, "cells", None)
+    if cells is not None:
+        return list(cells)
+    if len(board) == 81:
+        return list(board)
+    return [v for row in board for v in row]
+
+
+def unflatten(cells):
+    return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+
+def to_string(board):
+    return "".join(str(v) for row in board for v in row)
+
+
+def from_string(text):
+    return [[int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
@@ -0,0 +1,42 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# "Next logical step" queries on a game in progress. The GameModel already
+# keeps pencil-mark candidates live, so a query only copies them and climbs
+# the same technique ladder the rater uses: eliminations are applied to the
+# copy and collected until some technique places a digit. When the ladder is
+# stuck, the cell with the fewest candidates is filled from the known
+# solution and reported as trial and error. Nothing is ever re-solved.
+
+from .grid import ROW_OF, COL_OF, POPCOUNT, DIGITS_OF
+from .rating import LEVEL_TRIAL, TECHNIQUES, _Grid
+
+
+def next_step(model):
+    # Returns (row, col, digit, level, eliminations), or None when the board
+    # is full. eliminations lists (row, col, digits) taken out on the way,
+    # in the order they were found; level indexes rating.LEVEL_NAMES.
+    if model.first_empty() is None:
+        return None
+    grid = _Grid(model.values, model.cand)
+    grid.removed = []
+    level = 0
+    while grid.ok:
+        for technique_level, technique in TECHNIQUES:
+            if technique(grid):
+                level = max(level, technique_level)
+                break
+        else:
+            break
+        if grid.placed is not None:
+            idx, digit = grid.placed
+            return ROW_OF[idx], COL_OF[idx], digit, level, _eliminations(grid.removed)
+    cand = model.cand
+    idx = min((i for i in range(81) if not model.values[i]), key=lambda i: POPCOUNT[cand[i]])
+    return ROW_OF[idx], COL_OF[idx], model.solution[idx], LEVEL_TRIAL, []
+
+
+def _eliminations(removed):
+    by_cell = {}
+    for idx, mask in removed:
+        by_cell[idx] = by_cell.get(idx, 0) | mask
+    return [(ROW_OF[idx], COL_OF[idx], DIGITS_OF[mask]) for idx, mask in by_cell.items()]
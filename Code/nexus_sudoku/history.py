@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Undo/redo log of cell changes. A move is packed into one 16-bit value,
+# cell << 8 | old << 4 | new, so the whole log is a single array('H') at two
+# bytes per move. Moves above `pos` have been undone and are kept for redo
+# until a new move replaces them. Once the log holds more than `limit` moves
+# the oldest ones are dropped down to half the limit, which bounds memory and
+# keeps trimming amortized O(1) per move.
+
+from array import array
+
+
+def _unpack(move):
+    return move >> 8, move >> 4 & 0xF, move & 0xF
+
+
+class MoveHistory:
+    def __init__(self, limit=4096):
+        self.limit = max(2, limit)
+        self.moves = array("H")
+        self.pos = 0
+
+    def clear(self):
+        del self.moves[:]
+        self.pos = 0
+
+    def push(self, cell, old, new):
+        moves = self.moves
+        if self.pos < len(moves):
+            del moves[self.pos:]
+        moves.append(cell << 8 | old << 4 | new)
+        if len(moves) > self.limit:
+            del moves[:len(moves) - self.limit // 2]
+        self.pos = len(moves)
+
+    def can_undo(self):
+        return self.pos > 0
+
+    def can_redo(self):
+        return self.pos < len(self.moves)
+
+    def undo(self):
+        # Returns (cell, old, new) of the move to take back, or None.
+        if not self.pos:
+            return None
+        self.pos -= 1
+        return _unpack(self.moves[self.pos])
+
+    def redo(self):
+        if self.pos == len(self.moves):
+            return None
+        self.pos += 1
+        return _unpack(self.moves[self.pos - 1])
+
+    def __len__(self):
+        return len(self.moves)
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Opt-in instrumentation. With NEXUS_SUDOKU_INSTRUMENT=1 in the environment,
+# functions decorated with timed() record their latency and observe() /
+# count() record values such as solver node counts; snapshot() and dump()
+# return or write everything as JSON. Without it timed() hands back the
+# function unchanged and the other hooks are only reached behind an
+# `if instrument.ENABLED` check, so the cost is nil. The switch is read
+# once, at import, because the decorators are applied then.
+#
+# Values go into power-of-two histograms: bucket k counts values v with
+# 2**(k-1) <= v < 2**k (bucket 0 holds v < 1). Latencies are microseconds.
+#
+# NEXUS_SUDOKU_PROFILE=cprofile,tracemalloc (either or both) additionally
+# captures a cProfile profile and/or the top allocation sites between
+# start_profiling() and stop_profiling().
+
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("NEXUS_SUDOKU_INSTRUMENT") == "1"
+PROFILE = {mode for mode in os.environ.get("NEXUS_SUDOKU_PROFILE", "").split(",") if mode}
+
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()  # the puzzle pool records from its own thread
+_profiler = None
+
+
+class Histogram:
+    __slots__ = ("count", "total", "low", "high", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.low = None
+        self.high = None
+        self.buckets = []
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+        k = int(value).bit_length()
+        buckets = self.buckets
+        if k >= len(buckets):
+            buckets.extend([0] * (k + 1 - len(buckets)))
+        buckets[k] += 1
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th percentile.
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return 1 << k
+        return 1 << len(self.buckets)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.low,
+            "max": self.high,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": self.buckets,
+        }
+
+
+def observe(name, value):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(value)
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def timed(name):
+    # Decorator recording the call count and latency of fn under `name`.
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        key = name + ".us"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(key, (time.perf_counter() - start) * 1e6)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: h.to_dict() for name, h in sorted(_histograms.items())},
+        }
+
+
+def dump(path):
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=1)
+    return path
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def start_profiling():
+    global _profiler
+    if "cprofile" in PROFILE and _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    if "tracemalloc" in PROFILE:
+        import tracemalloc
+        tracemalloc.start(16)
+
+
+def stop_profiling(prefix, top=40):
+    # Writes <prefix>.prof (load with pstats or snakeviz) and
+    # <prefix>.tracemalloc.txt; returns the paths written.
+    global _profiler
+    written = []
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(prefix + ".prof")
+        _profiler = None
+        written.append(prefix + ".prof")
+    if "tracemalloc" in PROFILE:
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            stats = tracemalloc.take_snapshot().statistics("lineno")
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(prefix + ".tracemalloc.txt", "w") as f:
+                f.write(f"current {current} bytes, peak {peak} bytes\n")
+                for stat in stats[:top]:
+                    f.write(f"{stat}\n")
+            written.append(prefix + ".tracemalloc.txt")
+    return written
@@ -0,0 +1,217 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Crash-safe journal of the game in progress. The file is a snapshot line
+# followed by one line per change:
+#   S {json}                                   full game state
+#   M cell value hints mistakes elapsed        a cell changed
+#   T elapsed                                  play time went on
+# Callers only append to an in-memory batch. A writer thread picks the batch
+# up at most every `interval` seconds, writes it, and fsyncs once, so a
+# keystroke never waits on the disk; a crash loses at most that interval.
+# Every `snapshot_every` lines the journal is compacted: a fresh snapshot is
+# written to a temporary file and renamed over the old journal, and the
+# directory is fsync'd so the rename itself survives a crash. A failed write
+# (disk full, permissions) drops its batch and the next change starts over
+# from a snapshot, so the journal never replays on top of a gap.
+
+import json
+import os
+import sys
+import threading
+
+STATE_KEYS = ("username", "difficulty", "puzzle", "solution", "values", "hints", "mistakes", "elapsed")
+
+
+def _digits(cells):
+    return "".join(map(str, cells))
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # Windows cannot open a directory; its renames are durable enough
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class GameJournal:
+    def __init__(self, path, interval=1.0, snapshot_every=64):
+        self.path = path
+        self.interval = interval
+        self.snapshot_every = snapshot_every
+        self.state = None
+        self._lines = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._file = None
+        self._resync = False
+
+    def begin(self, username, difficulty, puzzle, solution, values=None, hints=0, mistakes=0, elapsed=0.0):
+        # Starts (or restarts) the journal for a game; puzzle, solution and
+        # values are flat 81-cell sequences.
+        self.state = {
+            "username": username,
+            "difficulty": difficulty,
+            "puzzle": _digits(puzzle),
+            "solution": _digits(solution),
+            "values": bytearray(puzzle if values is None else values),
+            "hints": hints,
+            "mistakes": mistakes,
+            "elapsed": elapsed,
+        }
+        self._snapshot()
+
+    def record(self, cell, value, hints, mistakes, elapsed):
+        if self.state is None:
+            return
+        state = self.state
+        state["values"][cell] = value
+        state["hints"] = hints
+        state["mistakes"] = mistakes
+        state["elapsed"] = elapsed
+        self._append(f"M {cell} {value} {hints} {mistakes} {elapsed:.3f}\n")
+
+    def note_time(self, elapsed):
+        if self.state is None:
+            return
+        self.state["elapsed"] = elapsed
+        self._append(f"T {elapsed:.3f}\n")
+
+    def discard(self):
+        # The game is over (or the player declined to resume): drop the file.
+        self.state = None
+        self._queue(("discard", None))
+
+    def close(self):
+        # Writes everything still pending, fsyncs and stops the writer.
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _snapshot(self):
+        state = dict(self.state, values=_digits(self.state["values"]))
+        self._lines = 0
+        self._resync = False
+        self._queue(("snapshot", "S " + json.dumps(state, separators=(",", ":")) + "\n"))
+
+    def _append(self, line):
+        self._lines += 1
+        if self._lines >= self.snapshot_every or self._resync:
+            self._snapshot()
+        else:
+            self._queue(("line", line))
+
+    def _queue(self, item):
+        with self._cond:
+            self._pending.append(item)
+            if len(self._pending) == 1:
+                self._cond.notify_all()
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="game-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if not self._stopped:
+                    # Let the batch collect for one interval; only close() cuts it short.
+                    self._cond.wait(self.interval)
+                batch, self._pending = self._pending, []
+                stopped = self._stopped
+            try:
+                self._write(batch)
+                if stopped:
+                    self._close_file()
+            except OSError as e:
+                self._failed(e)
+            if stopped:
+                return
+
+    def _write(self, batch):
+        dirty = False
+        for kind, text in batch:
+            if kind == "line":
+                if self._file is None:
+                    self._file = open(self.path, "a")
+                self._file.write(text)
+                dirty = True
+            elif kind == "snapshot":
+                self._close_file()
+                tmp = self.path + ".tmp"
+                with open(tmp, "w") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                _fsync_dir(self.path)
+                self._file = open(self.path, "a")
+                dirty = False
+            else:
+                self._close_file()
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+                dirty = False
+        if dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        if self._file is not None:
+            f, self._file = self._file, None
+            f.close()
+
+    def _failed(self, error):
+        print(f"Game journal: {error}; the unsaved changes are dropped", file=sys.stderr)
+        try:
+            self._close_file()
+        except OSError:
+            pass
+        self._resync = True
+
+
+def load_journal(path):
+    # Returns the saved game state (a dict with STATE_KEYS; values is an
+    # 81-digit string) or None. A line cut short by a crash ends the replay.
+    try:
+        with open(path, "r") as f:
+            text = f.read()
+    except OSError:
+        return None
+    state = None
+    values = None
+    for line in text.splitlines(keepends=True):
+        if not line.endswith("\n"):
+            break
+        try:
+            kind, _, rest = line.rstrip("\n").partition(" ")
+            if kind == "S":
+                state = json.loads(rest)
+                values = [int(ch) for ch in state["values"]]
+            elif kind == "M" and state is not None:
+                cell, value, hints, mistakes, elapsed = rest.split()
+                values[int(cell)] = int(value)
+                state["hints"] = int(hints)
+                state["mistakes"] = int(mistakes)
+                state["elapsed"] = float(elapsed)
+            elif kind == "T" and state is not None:
+                state["elapsed"] = float(rest)
+        except (ValueError, KeyError, IndexError):
+            break
+    if state is None or any(key not in state for key in STATE_KEYS):
+        return None
+    state["values"] = _digits(values)
+    return state
@@ -0,0 +1,120 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from .board import Board
+from .grid import ALL_DIGITS, ROW_OF, COL_OF, BOX_OF, PEERS, DIGITS_OF, flatten
+
+
+class GameModel:
+    # The player's view of the board, kept next to the widgets so the UI
+    # never has to read them back. Counts of filled cells per row, column and
+    # box and of cells matching the solution are updated on every set(), so
+    # completion is a single comparison. The cells that differ from the
+    # puzzle are tracked too, so rewind() only has to touch those. Pencil-mark
+    # candidates are kept live from per-unit digit masks; a set() refreshes
+    # the cell and its 20 peers. They assume a conflict-free board, which
+    # holds because only correct digits are ever entered.
+    def __init__(self, puzzle, solution):
+        self.givens = bytes(flatten(puzzle))
+        self.solution = bytes(flatten(solution))
+        self.reset()
+
+    def reset(self):
+        self.values = bytearray(self.givens)
+        self.row_filled = [0] * 9
+        self.col_filled = [0] * 9
+        self.box_filled = [0] * 9
+        self.correct = 0
+        self.changed = set()
+        self.row_used = [0] * 9
+        self.col_used = [0] * 9
+        self.box_used = [0] * 9
+        for idx, v in enumerate(self.values):
+            if v:
+                self._count(idx, v, 1)
+        self.cand = [self._candidates(idx) for idx in range(81)]
+
+    def _count(self, idx, v, delta):
+        self.row_filled[ROW_OF[idx]] += delta
+        self.col_filled[COL_OF[idx]] += delta
+        self.box_filled[BOX_OF[idx]] += delta
+        if v == self.solution[idx]:
+            self.correct += delta
+        bit = 1 << v
+        if delta > 0:
+            self.row_used[ROW_OF[idx]] |= bit
+            self.col_used[COL_OF[idx]] |= bit
+            self.box_used[BOX_OF[idx]] |= bit
+        else:
+            self.row_used[ROW_OF[idx]] &= ~bit
+            self.col_used[COL_OF[idx]] &= ~bit
+            self.box_used[BOX_OF[idx]] &= ~bit
+
+    def _candidates(self, idx):
+        if self.values[idx]:
+            return 0
+        return ALL_DIGITS & ~(self.row_used[ROW_OF[idx]] | self.col_used[COL_OF[idx]] | self.box_used[BOX_OF[idx]])
+
+    def get(self, row, col):
+        return self.values[row * 9 + col]
+
+    def is_given(self, row, col):
+        return self.givens[row * 9 + col] != 0
+
+    def is_correct(self, row, col, value):
+        return self.solution[row * 9 + col] == value
+
+    def answer(self, row, col):
+        return self.solution[row * 9 + col]
+
+    def set(self, row, col, value):
+        idx = row * 9 + col
+        old = self.values[idx]
+        if old == value:
+            return
+        if old:
+            self._count(idx, old, -1)
+        self.values[idx] = value
+        if value:
+            self._count(idx, value, 1)
+        if value == self.givens[idx]:
+            self.changed.discard(idx)
+        else:
+            self.changed.add(idx)
+        cand = self.cand
+        cand[idx] = self._candidates(idx)
+        for p in PEERS[idx]:
+            cand[p] = self._candidates(p)
+
+    def fill_solution(self):
+        self.values[:] = self.solution
+        self.row_filled = [9] * 9
+        self.col_filled = [9] * 9
+        self.box_filled = [9] * 9
+        self.correct = 81
+        self.row_used = [ALL_DIGITS] * 9
+        self.col_used = [ALL_DIGITS] * 9
+        self.box_used = [ALL_DIGITS] * 9
+        self.cand = [0] * 81
+        self.changed = {idx for idx in range(81) if self.values[idx] != self.givens[idx]}
+
+    def rewind(self):
+        # Back to the puzzle as given; returns the cells that were reverted.
+        cells = list(self.changed)
+        for idx in cells:
+            self.set(ROW_OF[idx], COL_OF[idx], self.givens[idx])
+        return cells
+
+    def candidates(self, row, col):
+        return DIGITS_OF[self.cand[row * 9 + col]]
+
+    def first_empty(self):
+        idx = self.values.find(0)
+        if idx < 0:
+            return None
+        return divmod(idx, 9)
+
+    def is_complete(self):
+        return self.correct == 81
+
+    def board(self):
+        return Board(self.values)
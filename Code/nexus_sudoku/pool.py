@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import collections
+import random
+import threading
+
+from . import instrument
+from .generator import DIFFICULTY_LEVELS, FullBoardGenerator, make_rated_puzzle, make_unique_puzzle
+
+
+class PuzzlePool:
+    # Keeps up to `depth` ready (puzzle, solution, attempts) entries per
+    # difficulty. A daemon thread tops the queues up in the background so
+    # get() normally just pops; only an empty queue falls back to generating
+    # on the caller's thread, and then always the quick unrated way. Each
+    # thread owns its own generator and RNG. With rated=True the worker also
+    # filters puzzles by technique level: one that rates outside the band it
+    # was made for is filed under the difficulty whose band it fits, or
+    # dropped if it fits none.
+    def __init__(self, clues_by_difficulty, depth=3, rated=False, levels_by_difficulty=DIFFICULTY_LEVELS):
+        self.clues_by_difficulty = dict(clues_by_difficulty)
+        self.levels_by_difficulty = dict(levels_by_difficulty)
+        self.depth = depth
+        self.rated = rated
+        self.queues = {d: collections.deque() for d in self.clues_by_difficulty}
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._generator = FullBoardGenerator(random.Random())
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._refill, name="puzzle-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @instrument.timed("pool.get")
+    def get(self, difficulty):
+        with self._cond:
+            queue = self.queues[difficulty]
+            if queue:
+                self.hits += 1
+                if instrument.ENABLED:
+                    instrument.count("pool.hits")
+                entry = queue.popleft()
+                self._cond.notify_all()
+                return entry
+            self.misses += 1
+            self._cond.notify_all()
+        if instrument.ENABLED:
+            instrument.count("pool.misses")
+        # Rating can take seconds; the caller is usually the UI thread.
+        return self._make_unrated(self._generator, difficulty)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejected": self.rejected,
+                "ready": {d: len(q) for d, q in self.queues.items()},
+            }
+
+    def _make_unrated(self, generator, difficulty):
+        full_board = generator.generate()
+        puzzle, attempts = make_unique_puzzle(full_board, self.clues_by_difficulty[difficulty], generator.rng)
+        return puzzle, full_board, attempts
+
+    def _make(self, generator, difficulty):
+        # Returns (difficulty to file the entry under or None, entry).
+        if not self.rated:
+            return difficulty, self._make_unrated(generator, difficulty)
+        puzzle, full_board, attempts, level = make_rated_puzzle(
+            generator, difficulty, clues=self.clues_by_difficulty[difficulty],
+            levels=self.levels_by_difficulty[difficulty])
+        return self._band_of(level, difficulty), (puzzle, full_board, attempts)
+
+    def _band_of(self, level, difficulty):
+        low, high = self.levels_by_difficulty[difficulty]
+        if low <= level <= high:
+            return difficulty
+        for other, (low, high) in self.levels_by_difficulty.items():
+            if other in self.queues and low <= level <= high:
+                return other
+        return None
+
+    def _next_to_fill(self):
+        # The shortest queue below depth, so a drained difficulty is served first.
+        lowest = None
+        for difficulty, queue in self.queues.items():
+            if len(queue) < self.depth and (lowest is None or len(queue) < len(self.queues[lowest])):
+                lowest = difficulty
+        return lowest
+
+    def _refill(self):
+        generator = FullBoardGenerator(random.Random())
+        while True:
+            with self._cond:
+                difficulty = self._next_to_fill()
+                while difficulty is None and not self._stopped:
+                    self._cond.wait()
+                    difficulty = self._next_to_fill()
+                if self._stopped:
+                    return
+            label, entry = self._make(generator, difficulty)
+            with self._cond:
+                if label is not None and len(self.queues[label]) < self.depth:
+                    self.queues[label].append(entry)
+                else:
+                    self.rejected += 1
+                    if instrument.ENABLED:
+                        instrument.count("pool.rejected")
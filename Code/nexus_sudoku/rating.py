@@ -0,0 +1,248 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Rates a puzzle by the hardest human technique needed to solve it. The
+# solver always applies the easiest technique that makes progress and only
+# climbs the ladder when everything below it is stuck, so the result is the
+# hardest step on the easiest logical path. Puzzles the ladder cannot finish
+# get LEVEL_TRIAL (they need guessing).
+
+import functools
+from itertools import combinations
+
+from .grid import ALL_DIGITS, ROWS, COLS, BOXES, UNITS, PEERS, ROW_OF, COL_OF, BOX_OF, POPCOUNT, DIGIT_OF, DIGITS_OF, flatten
+
+LEVEL_NAMES = (
+    "given",
+    "hidden single in box",
+    "single",
+    "locked candidates",
+    "pair",
+    "triple",
+    "x-wing",
+    "swordfish",
+    "trial and error",
+)
+LEVEL_TRIAL = len(LEVEL_NAMES) - 1
+
+
+class _Grid:
+    # placed and removed record what the last technique did when a caller
+    # (the hint engine) sets removed to a list; the rater leaves it None.
+    def __init__(self, cells, cand=None):
+        self.cells = list(cells)
+        self.ok = True
+        self.placed = None
+        self.removed = None
+        if cand is not None:
+            self.cand = list(cand)
+            return
+        self.cand = [0] * 81
+        for idx in range(81):
+            if not self.cells[idx]:
+                used = 0
+                for p in PEERS[idx]:
+                    used |= 1 << self.cells[p]
+                self.cand[idx] = ALL_DIGITS & ~used
+
+    def place(self, idx, d):
+        bit = 1 << d
+        if not self.cand[idx] & bit:
+            self.ok = False
+            return
+        self.cells[idx] = d
+        self.cand[idx] = 0
+        self.placed = (idx, d)
+        cand = self.cand
+        for p in PEERS[idx]:
+            if cand[p] & bit:
+                cand[p] &= ~bit
+                if not cand[p] and not self.cells[p]:
+                    self.ok = False
+
+    def eliminate(self, idx, mask):
+        if self.cand[idx] & mask:
+            if self.removed is not None:
+                self.removed.append((idx, self.cand[idx] & mask))
+            self.cand[idx] &= ~mask
+            if not self.cand[idx]:
+                self.ok = False
+            return True
+        return False
+
+    def solved(self):
+        return 0 not in self.cells
+
+
+def _hidden_singles(grid, units):
+    cand = grid.cand
+    for unit in units:
+        once = twice = 0
+        for idx in unit:
+            m = cand[idx]
+            twice |= once & m
+            once |= m
+        single = once & ~twice
+        if single:
+            for idx in unit:
+                m = cand[idx] & single
+                if m:
+                    grid.place(idx, DIGITS_OF[m][0])
+                    return True
+    return False
+
+
+def _box_singles(grid):
+    return _hidden_singles(grid, BOXES)
+
+
+def _singles(grid):
+    cand = grid.cand
+    for idx in range(81):
+        m = cand[idx]
+        if m and DIGIT_OF[m]:
+            grid.place(idx, DIGIT_OF[m])
+            return True
+    return _hidden_singles(grid, ROWS + COLS)
+
+
+def _locked_candidates(grid):
+    cand = grid.cand
+    progress = False
+    for d in range(1, 10):
+        bit = 1 << d
+        # Pointing: inside a box, the digit is confined to one row or column.
+        for box in BOXES:
+            spots = [idx for idx in box if cand[idx] & bit]
+            if len(spots) < 2:
+                continue
+            for line_of, lines in ((ROW_OF, ROWS), (COL_OF, COLS)):
+                line = line_of[spots[0]]
+                if all(line_of[idx] == line for idx in spots[1:]):
+                    for idx in lines[line]:
+                        if BOX_OF[idx] != BOX_OF[spots[0]]:
+                            progress |= grid.eliminate(idx, bit)
+        # Claiming: inside a row or column, the digit is confined to one box.
+        for line in ROWS + COLS:
+            spots = [idx for idx in line if cand[idx] & bit]
+            if len(spots) < 2:
+                continue
+            box = BOX_OF[spots[0]]
+            if all(BOX_OF[idx] == box for idx in spots[1:]):
+                for idx in BOXES[box]:
+                    if idx not in line:
+                        progress |= grid.eliminate(idx, bit)
+        if progress:
+            return True
+    return False
+
+
+def _subsets(grid, size):
+    cand = grid.cand
+    for unit in UNITS:
+        empty = [idx for idx in unit if cand[idx]]
+        if len(empty) <= size:
+            continue
+        # Naked subset: `size` cells sharing `size` candidates between them.
+        for cells in combinations([idx for idx in empty if POPCOUNT[cand[idx]] <= size], size):
+            union = 0
+            for idx in cells:
+                union |= cand[idx]
+            if POPCOUNT[union] == size:
+                progress = False
+                for idx in empty:
+                    if idx not in cells:
+                        progress |= grid.eliminate(idx, union)
+                if progress:
+                    return True
+        # Hidden subset: `size` digits that only fit in the same `size` cells.
+        present = 0
+        for idx in empty:
+            present |= cand[idx]
+        for digits in combinations(DIGITS_OF[present], size):
+            mask = 0
+            for d in digits:
+                mask |= 1 << d
+            cells = [idx for idx in empty if cand[idx] & mask]
+            if len(cells) == size:
+                progress = False
+                for idx in cells:
+                    progress |= grid.eliminate(idx, ALL_DIGITS & ~mask)
+                if progress:
+                    return True
+    return False
+
+
+def _fish(grid, size):
+    cand = grid.cand
+    for d in range(1, 10):
+        bit = 1 << d
+        for base, cover, cover_of in ((ROWS, COLS, COL_OF), (COLS, ROWS, ROW_OF)):
+            lines = []
+            for line in base:
+                spots = 0
+                for idx in line:
+                    if cand[idx] & bit:
+                        spots |= 1 << cover_of[idx]
+                if 2 <= POPCOUNT[spots] <= size:
+                    lines.append((line, spots))
+            for chosen in combinations(lines, size):
+                union = 0
+                for line, spots in chosen:
+                    union |= spots
+                if POPCOUNT[union] != size:
+                    continue
+                inside = set()
+                for line, spots in chosen:
+                    inside.update(line)
+                progress = False
+                for k in range(9):
+                    if union >> k & 1:
+                        for idx in cover[k]:
+                            if idx not in inside:
+                                progress |= grid.eliminate(idx, bit)
+                if progress:
+                    return True
+    return False
+
+
+TECHNIQUES = (
+    (1, _box_singles),
+    (2, _singles),
+    (3, _locked_candidates),
+    (4, lambda grid: _subsets(grid, 2)),
+    (5, lambda grid: _subsets(grid, 3)),
+    (6, lambda grid: _fish(grid, 2)),
+    (7, lambda grid: _fish(grid, 3)),
+)
+
+
+def rate_steps(board):
+    # Returns (level, steps) where steps counts how often each level's
+    # technique was applied.
+    grid = _Grid(flatten(board))
+    level = 0
+    steps = [0] * len(LEVEL_NAMES)
+    while grid.ok and not grid.solved():
+        for technique_level, technique in TECHNIQUES:
+            if technique(grid):
+                level = max(level, technique_level)
+                steps[technique_level] += 1
+                break
+        else:
+            return LEVEL_TRIAL, steps
+    if not grid.ok:
+        return LEVEL_TRIAL, steps
+    return level, steps
+
+
+@functools.lru_cache(maxsize=65536)
+def _rate_cached(key):
+    return rate_steps(key)[0]
+
+
+def rate(board):
+    return _rate_cached(bytes(flatten(board)))
+
+
+def level_name(level):
+    return LEVEL_NAMES[level]
@@ -0,0 +1,17 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Score of a finished (or running) game. Only whole seconds of play count.
+
+BASE_SCORE = 1000
+DIFFICULTY_BONUS = {
+    "easy": 0,
+    "medium": 300,
+    "hard": 600
+}
+HINT_PENALTY = 100
+MISTAKE_PENALTY = 50
+
+
+def score(difficulty, elapsed, hints, mistakes):
+    points = BASE_SCORE + DIFFICULTY_BONUS[difficulty] - int(elapsed) - HINT_PENALTY * hints - MISTAKE_PENALTY * mistakes
+    return max(0, points)
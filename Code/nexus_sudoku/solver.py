@@ -0,0 +1,171 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from .grid import ALL_DIGITS, ROW_OF, COL_OF, BOX_OF, UNITS, POPCOUNT, DIGIT_OF, flatten, unflatten
+
+
+class BitmaskSolver:
+    # Keeps one "digits used" mask per row, column and box, so the candidates
+    # of a cell are a single OR/NOT away. Singles are propagated between
+    # branches and every placement is recorded on a trail that is unwound on
+    # backtrack, so no state is ever rebuilt by rescanning the grid.
+    def __init__(self, board):
+        self.cells = flatten(board)
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.nodes = 0
+        self.consistent = True
+        for idx, v in enumerate(self.cells):
+            if v:
+                bit = 1 << v
+                r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+                    self.consistent = False
+                self.rows[r] |= bit
+                self.cols[c] |= bit
+                self.boxes[b] |= bit
+
+    def candidates(self, idx):
+        if self.cells[idx]:
+            return 0
+        return ALL_DIGITS & ~(self.rows[ROW_OF[idx]] | self.cols[COL_OF[idx]] | self.boxes[BOX_OF[idx]])
+
+    def solve(self):
+        if not self.consistent:
+            return False
+        return self._search()
+
+    def solution(self):
+        return unflatten(self.cells)
+
+    def _assign(self, idx, d):
+        bit = 1 << d
+        self.cells[idx] = d
+        self.rows[ROW_OF[idx]] |= bit
+        self.cols[COL_OF[idx]] |= bit
+        self.boxes[BOX_OF[idx]] |= bit
+
+    def _clear(self, idx):
+        bit = 1 << self.cells[idx]
+        self.cells[idx] = 0
+        self.rows[ROW_OF[idx]] ^= bit
+        self.cols[COL_OF[idx]] ^= bit
+        self.boxes[BOX_OF[idx]] ^= bit
+
+    def _propagate(self, trail):
+        cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+        while True:
+            placed = False
+            # Naked singles: a cell with exactly one candidate left.
+            for idx in range(81):
+                if cells[idx]:
+                    continue
+                r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                m = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b])
+                if not m:
+                    return False
+                if not m & (m - 1):
+                    cells[idx] = DIGIT_OF[m]
+                    rows[r] |= m
+                    cols[c] |= m
+                    boxes[b] |= m
+                    trail.append(idx)
+                    placed = True
+            if placed:
+                continue
+            # Hidden singles: a digit that fits in only one cell of a unit.
+            for unit in UNITS:
+                once = twice = used = 0
+                for idx in unit:
+                    v = cells[idx]
+                    if v:
+                        used |= 1 << v
+                    else:
+                        m = ALL_DIGITS & ~(rows[ROW_OF[idx]] | cols[COL_OF[idx]] | boxes[BOX_OF[idx]])
+                        twice |= once & m
+                        once |= m
+                if (once | used) != ALL_DIGITS:
+                    return False
+                single = once & ~twice
+                if not single:
+                    continue
+                for idx in unit:
+                    if cells[idx]:
+                        continue
+                    r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+                    m = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b]) & single
+                    if not m:
+                        continue
+                    if m & (m - 1):
+                        return False
+                    cells[idx] = DIGIT_OF[m]
+                    rows[r] |= m
+                    cols[c] |= m
+                    boxes[b] |= m
+                    trail.append(idx)
+                    placed = True
+            if not placed:
+                return True
+
+    def _search(self):
+        trail = []
+        if self._propagate(trail):
+            cells, rows, cols, boxes = self.cells, self.rows, self.cols, self.boxes
+            best, best_count, best_mask = -1, 10, 0
+            for idx in range(81):
+                if cells[idx]:
+                    continue
+                m = ALL_DIGITS & ~(rows[ROW_OF[idx]] | cols[COL_OF[idx]] | boxes[BOX_OF[idx]])
+                n = POPCOUNT[m]
+                if n < best_count:
+                    best, best_count, best_mask = idx, n, m
+                    if n == 2:
+                        break
+            if best < 0:
+                return True
+            m = best_mask
+            while m:
+                bit = m & -m
+                m ^= bit
+                self.nodes += 1
+                self._assign(best, DIGIT_OF[bit])
+                if self._search():
+                    return True
+                self._clear(best)
+        for idx in reversed(trail):
+            self._clear(idx)
+        return False
+
+
+def solve_board(board):
+    solver = BitmaskSolver(board)
+    if solver.solve():
+        return solver.solution()
+    return None
+
+
+# The original recursive backtracker, kept as a reference for benchmarks.
+def solve_backtracking(board):
+    def is_valid(row, col, num):
+        for i in range(9):
+            if board[row][i] == num or board[i][col] == num:
+                return False
+        start_row, start_col = 3*(row//3), 3*(col//3)
+        for i in range(3):
+            for j in range(3):
+                if board[start_row+i][start_col+j] == num:
+                    return False
+        return True
+    def solve():
+        for row in range(9):
+            for col in range(9):
+                if board[row][col] == 0:
+                    for num in range(1, 10):
+                        if is_valid(row, col, num):
+                            board[row][col] = num
+                            if solve():
+                                return True
+                            board[row][col] = 0
+                    return False
+        return True
+    return solve()
@@ -0,0 +1,265 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# Users, high scores and the full game history in one SQLite database. WAL mode lets several game
+# instances share the file: readers never block the writer, and every change
+# is a single-row statement (an insert or an upsert), so nothing is ever read,
+# edited and rewritten as a whole. The first open imports the old JSON files.
+#
+# Every game a player completes is appended to `games`. top_scores and
+# recent_games walk an index in order and stop after the rows they need, so
+# they do not slow down as the history grows into millions of games. The
+# percentile queries count on covering indexes and never read the table, but
+# they do visit the index entries of the games they rank.
+#
+# High scores carried over from the JSON files are flagged `imported` until a
+# recorded game beats them, since no game in the history backs them up.
+
+import json
+import os
+import pathlib
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    created INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS highscores (
+    username TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    imported INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (username, difficulty)
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    hints INTEGER NOT NULL,
+    mistakes INTEGER NOT NULL,
+    puzzle TEXT,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (difficulty, score DESC, elapsed);
+CREATE INDEX IF NOT EXISTS games_by_user ON games (username, difficulty, score);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (username, finished DESC);
+"""
+
+
+def _read_json(path):
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return None
+
+
+class Storage:
+    def __init__(self, path, timeout=5.0, readonly=False):
+        # readonly opens an existing database for queries only, and never
+        # creates, converts or migrates the file.
+        self.path = path
+        if readonly:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"no database at {path}")
+            uri = pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+            self.db = sqlite3.connect(uri, timeout=timeout, isolation_level=None, uri=True)
+            return
+        # Autocommit mode; multi-statement changes open their own transaction.
+        self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _migrate(self):
+        # Databases from before the imported flag: every high score saved
+        # since then came with a recorded game, so the ones no game reaches
+        # are the imported ones.
+        db = self.db
+        if "imported" in self._columns("highscores"):
+            return
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if "imported" not in self._columns("highscores"):
+                db.execute("ALTER TABLE highscores ADD COLUMN imported INTEGER NOT NULL DEFAULT 0")
+                db.execute(
+                    "UPDATE highscores SET imported = 1 WHERE NOT EXISTS (SELECT 1 FROM games WHERE "
+                    "games.username = highscores.username AND games.difficulty = highscores.difficulty "
+                    "AND games.score >= highscores.score)")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _columns(self, table):
+        return {row[1] for row in self.db.execute(f"PRAGMA table_info({table})")}
+
+    def import_json(self, user_list_file=None, highscore_file=None, user_file=None):
+        # Runs once per database; BEGIN IMMEDIATE makes a second instance
+        # starting at the same time wait and then see the "imported" flag.
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("SELECT 1 FROM settings WHERE key = 'imported'").fetchone():
+                db.execute("COMMIT")
+                return False
+            users = _read_json(user_list_file)
+            if isinstance(users, list):
+                db.executemany("INSERT OR IGNORE INTO users VALUES (?, ?)",
+                               ((u, i) for i, u in enumerate(users) if isinstance(u, str)))
+            scores = _read_json(highscore_file)
+            if isinstance(scores, dict):
+                for username, by_difficulty in scores.items():
+                    if isinstance(by_difficulty, dict):
+                        for difficulty, score in by_difficulty.items():
+                            # Corrupt entries are skipped, as the JSON loader used to
+                            try:
+                                self._upsert_score(username, difficulty, int(score), imported=1)
+                            except (TypeError, ValueError, OverflowError):
+                                pass
+            active = _read_json(user_file)
+            if isinstance(active, dict) and active.get("username"):
+                self._set("active_user", active["username"])
+            self._set("imported", "1")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return True
+
+    def users(self):
+        return [row[0] for row in self.db.execute("SELECT username FROM users ORDER BY created, rowid")]
+
+    def has_user(self, username):
+        return self.db.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def add_user(self, username):
+        # False when the name is taken, decided by the primary key rather than
+        # a check-then-write that two instances could interleave.
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO users SELECT ?, COALESCE(MAX(created), -1) + 1 FROM users", (username,))
+        return cur.rowcount == 1
+
+    def add_users(self, usernames):
+        for username in usernames:
+            self.add_user(username)
+
+    def active_user(self):
+        row = self.db.execute("SELECT value FROM settings WHERE key = 'active_user'").fetchone()
+        return row[0] if row else None
+
+    def set_active_user(self, username):
+        self._set("active_user", username)
+
+    def highscores(self, username):
+        cur = self.db.execute("SELECT difficulty, score FROM highscores WHERE username = ?", (username,))
+        return dict(cur.fetchall())
+
+    def imported_highscores(self):
+        # {(username, difficulty)} whose high score came from the JSON files
+        return set(self.db.execute("SELECT username, difficulty FROM highscores WHERE imported"))
+
+    def highscore(self, username, difficulty):
+        row = self.db.execute("SELECT score FROM highscores WHERE username = ? AND difficulty = ?",
+                              (username, difficulty)).fetchone()
+        return row[0] if row else 0
+
+    def save_highscore(self, username, difficulty, score):
+        # Keeps the better of the stored and the new score; returns the result.
+        self._upsert_score(username, difficulty, score)
+        return self.highscore(username, difficulty)
+
+    def record_game(self, username, difficulty, score, elapsed, hints, mistakes, puzzle=None, finished=None):
+        # puzzle is the 81-character givens string; it identifies (and can
+        # replay) the game the way a seed would.
+        if finished is None:
+            finished = time.time()
+        cur = self.db.execute("INSERT INTO games VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              (username, difficulty, score, elapsed, hints, mistakes, puzzle, finished))
+        return cur.lastrowid
+
+    def top_scores(self, difficulty, n=10):
+        # [(username, score, elapsed, hints, mistakes, finished)], best first
+        return self.db.execute(
+            "SELECT username, score, elapsed, hints, mistakes, finished FROM games "
+            "WHERE difficulty = ? ORDER BY score DESC, elapsed LIMIT ?", (difficulty, n)).fetchall()
+
+    def recent_games(self, username, n=10, since=None):
+        # [(difficulty, score, elapsed, hints, mistakes, puzzle, finished)],
+        # newest first; `since` limits the window to games finished after it.
+        if since is None:
+            since = float("-inf")
+        return self.db.execute(
+            "SELECT difficulty, score, elapsed, hints, mistakes, puzzle, finished FROM games "
+            "WHERE username = ? AND finished > ? ORDER BY finished DESC LIMIT ?", (username, since, n)).fetchall()
+
+    def game_count(self, username, difficulty):
+        return self.db.execute("SELECT COUNT(*) FROM games WHERE username = ? AND difficulty = ?",
+                               (username, difficulty)).fetchone()[0]
+
+    def user_percentile(self, username, difficulty, p):
+        # Score at percentile p (0-100) of the user's games, nearest rank: the
+        # lowest score with fewer than count - rank games above it. Scores are
+        # small integers, so bisecting the score range takes about a dozen
+        # COUNTs on games_by_user; the cost follows this user's games on this
+        # difficulty, not the whole history.
+        key = (username, difficulty)
+        count, low, high = self.db.execute(
+            "SELECT COUNT(*), MIN(score), MAX(score) FROM games WHERE username = ? AND difficulty = ?", key).fetchone()
+        if not count:
+            return None
+        rank = min(count - 1, max(0, -(-p * count // 100) - 1))
+        while low < high:
+            mid = (low + high) // 2
+            above = self.db.execute("SELECT COUNT(*) FROM games WHERE username = ? AND difficulty = ? AND score > ?",
+                                    key + (mid,)).fetchone()[0]
+            if above < count - rank:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+
+    def percentile_rank(self, difficulty, score):
+        # Percentage of all games on this difficulty that scored below `score`.
+        # Counted on the covering index, so the table itself is never read.
+        total, below = self.db.execute(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE score < ?) FROM games WHERE difficulty = ?",
+            (score, difficulty)).fetchone()
+        return 100.0 * below / total if total else None
+
+    def _upsert_score(self, username, difficulty, score, imported=0):
+        self.db.execute(
+            "INSERT INTO highscores (username, difficulty, score, imported) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (username, difficulty) DO UPDATE SET score = MAX(score, excluded.score), "
+            "imported = CASE WHEN excluded.score > score THEN excluded.imported ELSE imported END",
+            (username, difficulty, score, imported))
+
+    def _set(self, key, value):
+        self.db.execute("INSERT INTO settings VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                        (key, value))
+
+
+def open_storage(path, user_list_file=None, highscore_file=None, user_file=None):
+    # Opens the database and, the first time only, imports the JSON files.
+    storage = Storage(path)
+    storage.import_json(user_list_file, highscore_file, user_file)
+    return storage
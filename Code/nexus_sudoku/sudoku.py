@@ -0,0 +1,39 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from . import dlx, instrument
+from .board import Board
+from .solver import BitmaskSolver
+
+
+class Sudoku:
+    def __init__(self, starting_board):
+        self.starting_board = Board.from_lists(starting_board)
+        self.board = self.starting_board.copy()
+    def is_valid(self, row, col, num):
+        cells = self.board.cells
+        for i in range(9):
+            if cells[row*9+i] == num or cells[i*9+col] == num:
+                return False
+        start = 27*(row//3) + 3*(col//3)
+        for i in range(3):
+            for j in range(3):
+                if cells[start+i*9+j] == num:
+                    return False
+        return True
+    @instrument.timed("Sudoku.solve")
+    def solve(self):
+        solver = BitmaskSolver(self.board)
+        solved = solver.solve()
+        if instrument.ENABLED:
+            instrument.count("solver.calls")
+            instrument.observe("solver.nodes", solver.nodes)
+            if not solved:
+                instrument.count("solver.unsolvable")
+        if not solved:
+            return False
+        self.board.cells[:] = bytes(solver.cells)
+        return True
+    def count_solutions(self, limit=None):
+        return dlx.count_solutions(self.starting_board, limit)
+    def iter_solutions(self):
+        return dlx.iter_solutions(self.starting_board)
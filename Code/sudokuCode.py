@@ -2,12 +2,23 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import copy
-import random
-import time
-import json
+import heapq
 import os
+import sys
+import time
+from nexus_sudoku.board import Board
+from nexus_sudoku.sudoku import Sudoku
+from nexus_sudoku import instrument, scoring
+from nexus_sudoku.generator import DIFFICULTY_CLUES, FullBoardGenerator, make_unique_puzzle
+from nexus_sudoku.pool import PuzzlePool
+from nexus_sudoku.bank import PuzzleBank
+from nexus_sudoku.model import GameModel
+from nexus_sudoku.clock import GameClock
+from nexus_sudoku.storage import open_storage
+from nexus_sudoku.journal import GameJournal, load_journal
+from nexus_sudoku.history import MoveHistory
+from nexus_sudoku.hints import next_step
+from nexus_sudoku.rating import level_name
 
 # --- DARK MODE COLORS ---
 DARK_BG = "#181a20"
@@ -28,115 +39,114 @@ ENTRY_HIGHLIGHT_BG = "#ffeaa7"
 ENTRY_HINT_BG = "#ffeaa7"
 BTN_ACCENT_FG = "#262626"
 
-DIFFICULTY_CLUES = {
-    "easy": 36,
-    "medium": 32,
-    "hard": 28
-}
-DIFFICULTY_BONUS = {
-    "easy": 0,
-    "medium": 300,
-    "hard": 600
-}
+PUZZLE_POOL_DEPTH = 3  # Ready puzzles kept per difficulty
+RATED_PUZZLES = True  # Match difficulties by solving technique, not only clue count
 HIGHSCORE_FILE = "highscores.json"
 USER_FILE = "user.json"
 USER_LIST_FILE = "users.json"
+STORAGE_FILE = "nexus_sudoku.db"  # Users and scores; the JSON files above are imported once
+JOURNAL_FILE = "game.journal"  # Game in progress, offered for resume on the next launch; one file per user
+JOURNAL_SYNC_SECONDS = 1.0  # Journal writes are batched and fsync'd at most this often
+JOURNAL_SNAPSHOT_LINES = 64  # Compact the journal into a fresh snapshot after this many changes
+UNDO_LIMIT = 4096  # Moves kept for undo; the oldest are dropped past this
+LIVE_HINTS = os.environ.get("NEXUS_SUDOKU_LIVE_HINTS") == "1"  # Show the next logical step after every move
+METRICS_FILE = "nexus_sudoku_metrics.json"  # Written on exit and on F12 when NEXUS_SUDOKU_INSTRUMENT=1
+PROFILE_PREFIX = "nexus_sudoku_profile"  # Output of NEXUS_SUDOKU_PROFILE=cprofile,tracemalloc
+TIMED_HANDLERS = ("start_game", "create_board", "fill_entries", "on_cell_key", "check_user_entry", "give_hint",
+                  "solve_board", "reset_board", "undo", "redo", "toggle_pause", "tick_score")
 LOGO_FILENAME = os.path.join(os.path.dirname(__file__), "logo.png")  # Always resolve relative to script location
+LOGO_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".logo_cache")  # Pre-resized PNGs Tk can load without PIL
+PUZZLE_BANK_FILE = os.path.join(os.path.dirname(__file__), "puzzles.bank")
+BOARD_RENDERER = os.environ.get("NEXUS_SUDOKU_RENDERER", "entries")  # "entries" or "canvas"
+REUSE_WIDGETS = True  # Keep the board, controls and menu alive between games
+FLASH_TICK_MS = 50  # Resolution of the cell flash scheduler
+CANVAS_CELL = 52
+CANVAS_PAD = 4
+
+_board_generator = FullBoardGenerator()
+_logo_images = {}
+_storage = None
+
+def process_age():
+    # Seconds since this process started, from /proc (10 ms resolution), or
+    # None where there is no /proc.
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        # Fields resume after the ")" closing the command name, which may
+        # hold spaces; the start time, in clock ticks after boot, is field 22
+        started = int(stat[stat.rindex(b")") + 2:].split()[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return max(0.0, uptime - started)
+
+# For the startup report: the process start on the perf_counter clock, or
+# the time this module loaded where the start is unknown
+STARTUP_AGE = process_age()
+STARTUP_BEGAN = time.perf_counter() - (STARTUP_AGE or 0.0)
 
 def generate_full_board():
-    board = [[0] * 9 for _ in range(9)]
-    def is_valid(board, row, col, num):
-        for i in range(9):
-            if board[row][i] == num or board[i][col] == num:
-                return False
-        start_row, start_col = 3*(row//3), 3*(col//3)
-        for i in range(3):
-            for j in range(3):
-                if board[start_row+i][start_col+j] == num:
-                    return False
-        return True
-    def fill(board):
-        for i in range(9):
-            for j in range(9):
-                if board[i][j] == 0:
-                    nums = list(range(1, 10))
-                    random.shuffle(nums)
-                    for num in nums:
-                        if is_valid(board, i, j, num):
-                            board[i][j] = num
-                            if fill(board):
-                                return True
-                            board[i][j] = 0
-                    return False
-        return True
-    fill(board)
-    return board
+    return _board_generator.generate()
 
 def make_puzzle(full_board, clues):
-    puzzle = copy.deepcopy(full_board)
-    cells = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(cells)
-    for (i, j) in cells:
-        if sum(1 for row in puzzle for v in row if v != 0) <= clues:
-            break
-        puzzle[i][j] = 0
-    return puzzle
+    return make_unique_puzzle(full_board, clues)[0]
+
+def get_logo(size):
+    # One PhotoImage per size for the whole run, shared by every window that
+    # shows the logo. A resized copy is saved as PNG next to the script so
+    # later launches load it straight into Tk and never import PIL.
+    if size in _logo_images:
+        return _logo_images[size]
+    w, h = size
+    cached = os.path.join(LOGO_CACHE_DIR, f"logo_{w}x{h}.png")
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(LOGO_FILENAME):
+        image = tk.PhotoImage(file=cached)
+    else:
+        from PIL import Image, ImageTk
+        img = Image.open(LOGO_FILENAME).resize(size, Image.LANCZOS)
+        try:
+            os.makedirs(LOGO_CACHE_DIR, exist_ok=True)
+            img.save(cached)
+        except OSError:
+            pass
+        image = ImageTk.PhotoImage(img)
+    _logo_images[size] = image
+    return image
 
-def get_user_list():
-    if os.path.exists(USER_LIST_FILE):
+def open_puzzle_bank():
+    if os.path.exists(PUZZLE_BANK_FILE):
         try:
-            with open(USER_LIST_FILE, "r") as f:
-                users = json.load(f)
-                if isinstance(users, list):
-                    return users
+            return PuzzleBank(PUZZLE_BANK_FILE)
         except Exception:
             pass
-    return []
+    return None
+
+def journal_path(username):
+    # Hex keeps any username a valid, distinct file name
+    return f"{JOURNAL_FILE}.{username.encode('utf-8').hex()}"
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        _storage = open_storage(STORAGE_FILE, USER_LIST_FILE, HIGHSCORE_FILE, USER_FILE)
+    return _storage
+
+def get_user_list():
+    return get_storage().users()
 
 def save_user_list(users):
-    with open(USER_LIST_FILE, "w") as f:
-        json.dump(users, f)
+    get_storage().add_users(users)
+
+def add_user(username):
+    return get_storage().add_user(username)
 
 def save_active_user(username):
-    with open(USER_FILE, "w") as f:
-        json.dump({"username": username}, f)
+    get_storage().set_active_user(username)
 
 def load_username():
-    if os.path.exists(USER_FILE):
-        try:
-            with open(USER_FILE, "r") as f:
-                data = json.load(f)
-                return data.get("username", None)
-        except Exception:
-            return None
-    return None
-
-class Sudoku:
-    def __init__(self, starting_board):
-        self.starting_board = copy.deepcopy(starting_board)
-        self.board = copy.deepcopy(self.starting_board)
-    def is_valid(self, row, col, num):
-        for i in range(9):
-            if self.board[row][i] == num or self.board[i][col] == num:
-                return False
-        start_row, start_col = 3*(row//3), 3*(col//3)
-        for i in range(3):
-            for j in range(3):
-                if self.board[start_row+i][start_col+j] == num:
-                    return False
-        return True
-    def solve(self):
-        for row in range(9):
-            for col in range(9):
-                if self.board[row][col] == 0:
-                    for num in range(1, 10):
-                        if self.is_valid(row, col, num):
-                            self.board[row][col] = num
-                            if self.solve():
-                                return True
-                            self.board[row][col] = 0
-                    return False
-        return True
+    return get_storage().active_user()
 
 class UsernameMenu:
     def __init__(self, root, on_submit, allow_cancel=False):
@@ -158,9 +168,7 @@ class UsernameMenu:
         logo_frame = tk.Frame(self.top, bg=DARK_BG)
         logo_frame.pack(pady=(15, 0))
         try:
-            img = Image.open(LOGO_FILENAME)
-            img = img.resize((80, 60), Image.ANTIALIAS)
-            self.logo_img = ImageTk.PhotoImage(img)
+            self.logo_img = get_logo((80, 60))
             logo_label = tk.Label(logo_frame, image=self.logo_img, bg=DARK_BG, bd=0)
             logo_label.pack()
         except Exception:
@@ -192,12 +200,9 @@ class UsernameMenu:
         if len(username) > 20:
             self.msg.config(text="Username too long (max 20 chars).")
             return
-        users = get_user_list()
-        if username in users:
+        if not add_user(username):
             self.msg.config(text="That username already exists. Choose another.")
             return
-        users.append(username)
-        save_user_list(users)
         save_active_user(username)
         self.top.destroy()
         self.on_submit(username)
@@ -300,8 +305,9 @@ class AccountSwitchMenu:
             self.listbox.activate(idx+1)
 
 class SudokuMenu:
-    def __init__(self, root, start_callback, username, account_switch_callback):
+    def __init__(self, root, start_callback, username, account_switch_callback, reusable=False):
         self.root = root
+        self.reusable = reusable
         self.start_callback = start_callback
         self.account_switch_callback = account_switch_callback
         self.username = username
@@ -321,9 +327,7 @@ class SudokuMenu:
         logo_frame = tk.Frame(self.menu_win, bg=DARK_BG)
         logo_frame.pack(pady=(30, 0))
         try:
-            img = Image.open(LOGO_FILENAME)
-            img = img.resize((180, 130), Image.ANTIALIAS)
-            self.logo_img = ImageTk.PhotoImage(img)
+            self.logo_img = get_logo((180, 130))
             logo_label = tk.Label(logo_frame, image=self.logo_img, bg=DARK_BG, bd=0)
             logo_label.pack()
         except Exception:
@@ -332,8 +336,8 @@ class SudokuMenu:
 
         title = tk.Label(self.menu_win, text="NEXUS SUDOKU", font=("Arial", 38, "bold"), bg=DARK_BG, fg=ACCENT)
         title.pack(pady=(0, 10))
-        subtitle = tk.Label(self.menu_win, text=f"Welcome, {self.username}! Choose your challenge:", font=("Arial", 17), bg=DARK_BG, fg=DESC_FG)
-        subtitle.pack(pady=(0, 18))
+        self.subtitle = tk.Label(self.menu_win, text=f"Welcome, {self.username}! Choose your challenge:", font=("Arial", 17), bg=DARK_BG, fg=DESC_FG)
+        self.subtitle.pack(pady=(0, 18))
 
         self.difficulties = [
             {
@@ -440,61 +444,319 @@ class SudokuMenu:
         self.start(self.difficulties[self.selected_idx]["key"])
 
     def start(self, difficulty):
-        self.menu_win.destroy()
+        self.close()
         self.start_callback(difficulty)
 
     def switch_account(self):
-        self.menu_win.destroy()
+        self.close()
         self.account_switch_callback()
 
+    def close(self):
+        if self.reusable:
+            self.menu_win.withdraw()
+        else:
+            self.menu_win.destroy()
+
+    def show(self, username):
+        self.username = username
+        self.subtitle.config(text=f"Welcome, {self.username}! Choose your challenge:")
+        self.menu_win.deiconify()
+        self.menu_win.lift()
+        self.highlight_selected()
+
+class FlashScheduler:
+    # Every timed cell colour change goes through one priority queue driven
+    # by a single after() timer, so at most one Tcl callback is pending no
+    # matter how fast the player types. A new flash for a cell supersedes the
+    # one already queued for it; superseded heap entries are skipped when
+    # popped and the heap is compacted if they pile up.
+    def __init__(self, widget, apply, tick_ms=FLASH_TICK_MS):
+        self.widget = widget
+        self.apply = apply
+        self.tick_ms = tick_ms
+        self.heap = []
+        self.latest = {}
+        self.seq = 0
+        self.after_id = None
+
+    def flash(self, row, col, color, delay_ms):
+        self.seq += 1
+        cell = (row, col)
+        self.latest[cell] = self.seq
+        heapq.heappush(self.heap, (time.monotonic() + delay_ms / 1000, self.seq, cell, color))
+        if len(self.heap) > 2 * len(self.latest) + 16:
+            self.heap = [item for item in self.heap if self.latest.get(item[2]) == item[1]]
+            heapq.heapify(self.heap)
+        self.schedule()
+
+    def cancel(self, row, col):
+        self.latest.pop((row, col), None)
+
+    def cancel_all(self):
+        self.latest.clear()
+        self.heap.clear()
+
+    def pending(self):
+        return len(self.latest)
+
+    def schedule(self):
+        if self.after_id is None and self.latest:
+            self.after_id = self.widget.after(self.tick_ms, self.tick)
+
+    def tick(self):
+        self.after_id = None
+        now = time.monotonic()
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            due, seq, cell, color = heapq.heappop(heap)
+            if self.latest.get(cell) == seq:
+                del self.latest[cell]
+                self.apply(cell[0], cell[1], color)
+        if not self.latest:
+            heap.clear()
+        self.schedule()
+
+class CanvasCell:
+    # Stands in for a cell's tk.Entry when the board is drawn on a canvas.
+    # It accepts the same get/insert/delete/config/after calls SudokuApp
+    # makes on entries, records the new state and marks the cell dirty so the
+    # canvas only redraws what actually changed.
+    def __init__(self, board, idx):
+        self.board = board
+        self.idx = idx
+        self.text = ""
+        self.options = {
+            "bg": ENTRY_BG,
+            "fg": ENTRY_FG,
+            "disabledbackground": ENTRY_DISABLED_BG,
+            "disabledforeground": ENTRY_DISABLED_FG,
+            "state": "normal",
+        }
+
+    def get(self):
+        return self.text
+
+    def insert(self, index, text):
+        if index == tk.END:
+            self.text += text
+        else:
+            self.text = self.text[:index] + text + self.text[index:]
+        self.board.mark(self.idx)
+
+    def delete(self, first, last=None):
+        self.text = ""
+        self.board.mark(self.idx)
+
+    def config(self, **options):
+        for key, value in options.items():
+            if key in self.options:
+                self.options[key] = value
+        self.board.mark(self.idx)
+
+    configure = config
+
+    def after(self, ms, func):
+        return self.board.canvas.after(ms, func)
+
+    def after_cancel(self, after_id):
+        self.board.canvas.after_cancel(after_id)
+
+    def look(self):
+        o = self.options
+        if o["state"] == "disabled":
+            return self.text, o["disabledbackground"], o["disabledforeground"]
+        return self.text, o["bg"], o["fg"]
+
+class CanvasBoard:
+    # The whole grid on one tk.Canvas: a rectangle and a text item per cell,
+    # one click handler and one key handler. Changes are batched and
+    # flushed once per idle cycle, touching only cells whose look changed.
+    def __init__(self, app, parent):
+        self.app = app
+        size = 9 * CANVAS_CELL + 2 * CANVAS_PAD
+        self.canvas = tk.Canvas(parent, width=size, height=size, bg=app.panel, highlightthickness=0, takefocus=1)
+        self.canvas.pack()
+        self.cells = [CanvasCell(self, idx) for idx in range(81)]
+        self.rects = []
+        self.texts = []
+        self.dirty = set()
+        self.flush_pending = False
+        self.selected = None
+        for idx in range(81):
+            x = CANVAS_PAD + (idx % 9) * CANVAS_CELL
+            y = CANVAS_PAD + (idx // 9) * CANVAS_CELL
+            self.rects.append(self.canvas.create_rectangle(x + 1, y + 1, x + CANVAS_CELL - 1, y + CANVAS_CELL - 1,
+                                                           fill=ENTRY_BG, outline=""))
+            self.texts.append(self.canvas.create_text(x + CANVAS_CELL // 2, y + CANVAS_CELL // 2, text="",
+                                                      font=('Arial', 22, 'bold'), fill=ENTRY_FG))
+        self.drawn = [cell.look() for cell in self.cells]
+        for k in range(10):
+            pos = CANVAS_PAD + k * CANVAS_CELL
+            color, width = (ACCENT, 2) if k % 3 == 0 and 0 < k < 9 else (BTN_HIGHLIGHT, 1)
+            self.canvas.create_line(pos, CANVAS_PAD, pos, size - CANVAS_PAD, fill=color, width=width)
+            self.canvas.create_line(CANVAS_PAD, pos, size - CANVAS_PAD, pos, fill=color, width=width)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<KeyPress>", self.on_key)
+
+    def rows(self):
+        return [self.cells[r * 9:r * 9 + 9] for r in range(9)]
+
+    def mark(self, idx):
+        self.dirty.add(idx)
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.canvas.after_idle(self.flush)
+
+    def flush(self):
+        self.flush_pending = False
+        for idx in self.dirty:
+            look = self.cells[idx].look()
+            old = self.drawn[idx]
+            if look == old:
+                continue
+            if old is None or look[0] != old[0] or look[2] != old[2]:
+                self.canvas.itemconfig(self.texts[idx], text=look[0], fill=look[2])
+            if old is None or look[1] != old[1]:
+                self.canvas.itemconfig(self.rects[idx], fill=look[1])
+            self.drawn[idx] = look
+        self.dirty.clear()
+
+    def editable(self, cell):
+        return cell is not None and not self.app.model.is_given(*cell)
+
+    def select(self, cell):
+        if cell == self.selected:
+            return
+        if self.editable(self.selected):
+            self.app.unhighlight_cell(*self.selected)
+        self.selected = cell
+        if self.editable(cell):
+            self.app.highlight_cell(*cell)
+
+    def on_click(self, event):
+        if self.app.paused:
+            return
+        self.canvas.focus_set()
+        col = (event.x - CANVAS_PAD) // CANVAS_CELL
+        row = (event.y - CANVAS_PAD) // CANVAS_CELL
+        if 0 <= row < 9 and 0 <= col < 9:
+            self.select((row, col))
+
+    def on_key(self, event):
+        if self.app.paused:
+            return "break"
+        moves = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1)}
+        if event.keysym in moves:
+            row, col = self.selected or (0, 0)
+            dr, dc = moves[event.keysym]
+            self.select(((row + dr) % 9, (col + dc) % 9))
+            return "break"
+        if self.editable(self.selected):
+            return self.app.on_cell_key(event, *self.selected)
+        return None
+
 class SudokuApp:
-    def __init__(self, root):
+    def __init__(self, root, renderer=BOARD_RENDERER, reuse_widgets=REUSE_WIDGETS):
         self.root = root
         self.root.title("Sudoku Nexus")
+        if instrument.ENABLED:
+            # The timed wrappers shadow the methods, so every binding made later uses them
+            for name in TIMED_HANDLERS:
+                setattr(self, name, instrument.timed("ui." + name)(getattr(self, name)))
+            self.root.bind("<F12>", self.dump_metrics)
+        self.renderer = renderer
+        self.reuse_widgets = reuse_widgets
+        self.menu = None
+        self.flasher = FlashScheduler(self.root, self.set_cell_bg)
         self.entries = [[None for _ in range(9)] for _ in range(9)]
-        self.solved_board = None
         self.difficulty = None
         self.sudoku = None
+        self.model = None
+        self.puzzle_attempts = 0
         self.score_label = None
         self.highscore_label = None
         self.hints_used = 0
         self.mistakes_made = 0
-        self.start_time = None
+        self.clock = GameClock()
+        self.in_game = False  # A board is on screen, as opposed to the menus
+        self.finished = False
+        self.score_inputs = None
+        self.last_score = 0
+        self.shown_score = None
+        self.score_after_id = None
         self.username = None
         self.highscores = {}
         self.bg = DARK_BG
         self.panel = PANEL_BG
         self.fg = FG
         self.paused = False
-        self.pause_time = 0
         self.pause_btn = None
         self.pause_overlay = None
+        self.journal = None
+        self.history = MoveHistory(UNDO_LIMIT)
+
+        self.puzzle_bank = open_puzzle_bank()
+        # The pool only generates the difficulties the bank has no puzzles for
+        missing = {d: clues for d, clues in DIFFICULTY_CLUES.items()
+                   if self.puzzle_bank is None or not self.puzzle_bank.count_for(d)}
+        self.puzzle_pool = PuzzlePool(missing, PUZZLE_POOL_DEPTH, rated=RATED_PUZZLES)
+        if missing:
+            # Let the first frame paint before the refill thread competes for the GIL
+            self.root.after_idle(self.puzzle_pool.start)
 
         self.root.configure(bg=self.bg)
         self.root.geometry("680x720")
         self.root.resizable(False, False)
+        self.root.bind("<Control-z>", self.undo)
+        self.root.bind("<Control-y>", self.redo)
+        self.root.bind("<Control-Shift-Z>", self.redo)
         self.create_title()
         self.username = load_username()
         if not self.username:
             UsernameMenu(self.root, self.set_username)
         else:
             self.load_highscores()
-            SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu)
+            self.enter_menu()
+
+    def enter_menu(self):
+        if not self.offer_resume():
+            self.show_menu()
+
+    def offer_resume(self):
+        journal = self.user_journal()
+        state = load_journal(journal.path)
+        if state is None or state["username"] != self.username:
+            return False
+        if not messagebox.askyesno("Resume game", f"Resume your unfinished {state['difficulty']} game?"):
+            journal.discard()
+            return False
+        self.start_game(state["difficulty"], resume=state)
+        return True
+
+    def dump_metrics(self, event=None):
+        print("Metrics written to", instrument.dump(METRICS_FILE))
+
+    def show_menu(self):
+        if self.reuse_widgets and self.menu is not None:
+            self.menu.show(self.username)
+        else:
+            self.menu = SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu,
+                                   reusable=self.reuse_widgets)
 
     def set_username(self, username):
         if username:
             self.username = username
             self.load_highscores()
-            SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu)
+            self.enter_menu()
 
     def account_switch_menu(self):
         def after_switch(username):
             if username:
                 self.username = username
                 self.load_highscores()
-                SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu)
+                self.enter_menu()
             else:
-                SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu)
+                self.show_menu()
         AccountSwitchMenu(self.root, after_switch)
 
     def create_title(self):
@@ -506,9 +768,7 @@ class SudokuApp:
         self.logo_frame.pack(pady=10)
         # Try to display the logo. If not, show "NEXUS SUDOKU" as title.
         try:
-            img = Image.open(LOGO_FILENAME)
-            img = img.resize((180, 130), Image.ANTIALIAS)
-            self.logo_img = ImageTk.PhotoImage(img)
+            self.logo_img = get_logo((180, 130))
             logo_label = tk.Label(self.logo_frame, image=self.logo_img, bg=self.bg, bd=0)
             logo_label.pack()
             self.title_label = self.logo_frame
@@ -518,32 +778,130 @@ class SudokuApp:
             title_label.pack()
             self.title_label = title_label
 
-    def start_game(self, difficulty):
+    def start_game(self, difficulty, resume=None):
+        # resume is a saved journal state to continue instead of a new puzzle
         self.root.deiconify()
         self.difficulty = difficulty
         self.hints_used = 0
         self.mistakes_made = 0
-        self.start_time = time.time()
         self.paused = False
-        self.init_board()
-        self.create_board()
-        self.create_controls()
-        self.create_score_label()
-        self.create_highscore_label()
-
-    def init_board(self):
-        full_board = generate_full_board()
-        clues = DIFFICULTY_CLUES[self.difficulty]
-        puzzle = make_puzzle(full_board, clues)
+        self.finished = False
+        self.in_game = True
+        self.init_board(resume)
+        if self.reuse_widgets and getattr(self, "board_frame", None):
+            # Same widgets, new contents: no Tk widget is created or destroyed.
+            self.hide_pause_overlay()
+            if self.renderer == "canvas":
+                self.canvas_board.select(None)
+            self.fill_entries()
+            self.pause_btn.config(text="Pause")
+            self.update_highscore_label()
+        else:
+            self.create_board()
+            self.create_controls()
+            self.create_score_label()
+            self.create_highscore_label()
+            self.create_hint_label()
+        if resume is not None:
+            self.restore_progress(resume)
+        else:
+            self.clock.restart()
+            self.begin_journal()
+        self.update_hint_label()
+        self.refresh_score()
+        self.start_score_ticker()
+
+    def init_board(self, resume=None):
+        if resume is not None:
+            puzzle = Board.from_string(resume["puzzle"])
+            full_board = Board.from_string(resume["solution"])
+            self.puzzle_attempts = 0
+        elif self.puzzle_bank is not None and self.puzzle_bank.count_for(self.difficulty):
+            puzzle, full_board, _, _ = self.puzzle_bank.random(self.difficulty)
+            self.puzzle_attempts = 0
+        else:
+            puzzle, full_board, self.puzzle_attempts = self.puzzle_pool.get(self.difficulty)
         self.sudoku = Sudoku(puzzle)
-        self.solved_board = None
+        self.model = GameModel(puzzle, full_board)
+        self.history.clear()
         self.full_solution = full_board
 
+    def restore_progress(self, state):
+        for idx, ch in enumerate(state["values"]):
+            i, j = divmod(idx, 9)
+            if ch != "0" and not self.model.is_given(i, j):
+                self.model.set(i, j, int(ch))
+                self.entries[i][j].insert(0, ch)
+        self.hints_used = state["hints"]
+        self.mistakes_made = state["mistakes"]
+        self.clock.restart(state["elapsed"])
+        self.begin_journal()
+
+    def user_journal(self):
+        # Each user resumes their own game; switching accounts flushes and
+        # closes the previous user's journal.
+        path = journal_path(self.username)
+        if self.journal is None or self.journal.path != path:
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = GameJournal(path, JOURNAL_SYNC_SECONDS, JOURNAL_SNAPSHOT_LINES)
+        return self.journal
+
+    def begin_journal(self):
+        self.user_journal().begin(self.username, self.difficulty, self.model.givens, self.model.solution,
+                           self.model.values, self.hints_used, self.mistakes_made, self.clock.elapsed())
+
+    def journal_cell(self, row, col):
+        self.journal.record(row * 9 + col, self.model.get(row, col), self.hints_used, self.mistakes_made,
+                            self.clock.elapsed())
+
+    def record_move(self, row, col, old):
+        new = self.model.get(row, col)
+        if new != old:
+            self.history.push(row * 9 + col, old, new)
+        self.journal_cell(row, col)
+        if LIVE_HINTS:
+            self.update_hint_label()
+
+    def undo(self, event=None):
+        if self.model is not None and not self.paused and not self.finished:
+            move = self.history.undo()
+            if move is not None:
+                self.show_cell(move[0], move[1])
+        return "break"
+
+    def redo(self, event=None):
+        if self.model is not None and not self.paused and not self.finished:
+            move = self.history.redo()
+            if move is not None:
+                self.show_cell(move[0], move[2])
+                if self.is_puzzle_complete():
+                    self.show_score(final=True)
+        return "break"
+
+    def show_cell(self, idx, value):
+        row, col = divmod(idx, 9)
+        self.model.set(row, col, value)
+        entry = self.entries[row][col]
+        entry.config(fg=ENTRY_FG)
+        entry.delete(0, tk.END)
+        if value:
+            entry.insert(0, str(value))
+        self.journal_cell(row, col)
+        if LIVE_HINTS:
+            self.update_hint_label()
+
     def create_board(self):
+        self.flasher.cancel_all()
         if getattr(self, "board_frame", None):
             self.board_frame.destroy()
+        self.pause_overlay = None
         self.board_frame = tk.Frame(self.root, bg=self.panel)
         self.board_frame.pack(padx=30, pady=30)
+        if self.renderer == "canvas":
+            self.create_canvas_board()
+            return
+        givens = self.sudoku.starting_board.cells
         for i in range(9):
             for j in range(9):
                 frame = tk.Frame(
@@ -568,21 +926,50 @@ class SudokuApp:
                     disabledbackground=ENTRY_DISABLED_BG,
                     disabledforeground=ENTRY_DISABLED_FG,
                 )
-                if self.sudoku.starting_board[i][j] != 0:
-                    e.insert(0, str(self.sudoku.starting_board[i][j]))
+                val = givens[i * 9 + j]
+                if val != 0:
+                    e.insert(0, str(val))
                     e.config(state='disabled')
-                else:
+                if val == 0 or self.reuse_widgets:
+                    # Reused cells may hold a given in one game and be
+                    # editable in the next, so the handlers check the model.
                     e.bind("<FocusIn>", lambda event, x=i, y=j: self.highlight_cell(x, y))
                     e.bind("<FocusOut>", lambda event, x=i, y=j: self.unhighlight_cell(x, y))
-                    e.bind("<KeyRelease>", lambda event, x=i, y=j: self.check_user_entry(x, y))
+                    e.bind("<KeyPress>", lambda event, x=i, y=j: self.on_cell_key(event, x, y))
+                    # Without the Entry class bindings every edit goes through
+                    # on_cell_key: paste (Ctrl+V, and Ctrl+Y on X11), cut,
+                    # middle-click and the emacs-style keys cannot change a
+                    # cell behind the model's back.
+                    e.bindtags(tuple(tag for tag in e.bindtags() if tag != "Entry"))
+                    e.bind("<Button-1>", lambda event: event.widget.focus_set())
                 e.grid(row=0, column=0)
                 self.entries[i][j] = e
 
+    def create_canvas_board(self):
+        self.canvas_board = CanvasBoard(self, self.board_frame)
+        self.entries = self.canvas_board.rows()
+        givens = self.sudoku.starting_board.cells
+        for i in range(9):
+            for j in range(9):
+                val = givens[i * 9 + j]
+                if val != 0:
+                    self.entries[i][j].insert(0, str(val))
+                    self.entries[i][j].config(state='disabled')
+        self.canvas_board.canvas.focus_set()
+
     def highlight_cell(self, row, col):
-        self.entries[row][col].config(bg=ENTRY_HIGHLIGHT_BG)
+        if not self.model.is_given(row, col):
+            self.flasher.cancel(row, col)
+            self.entries[row][col].config(bg=ENTRY_HIGHLIGHT_BG)
 
     def unhighlight_cell(self, row, col):
-        self.entries[row][col].config(bg=ENTRY_BG)
+        if not self.model.is_given(row, col):
+            self.flasher.cancel(row, col)
+            self.entries[row][col].config(bg=ENTRY_BG)
+
+    def set_cell_bg(self, row, col, color):
+        try: self.entries[row][col].config(bg=color)
+        except tk.TclError: pass
 
     def create_controls(self):
         if getattr(self, "controls", None):
@@ -611,6 +998,8 @@ class SudokuApp:
         self.pause_btn.grid(row=0, column=4, padx=5)
 
     def show_pause_overlay(self):
+        # One frame over the whole board hides and blocks every cell at once,
+        # so pausing never restyles or redraws the cells themselves.
         if self.pause_overlay is not None:
             self.pause_overlay.lift()
             self.pause_overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
@@ -628,58 +1017,71 @@ class SudokuApp:
 
     def hide_pause_overlay(self):
         if self.pause_overlay is not None:
-            self.pause_overlay.destroy()
-            self.pause_overlay = None
+            self.pause_overlay.place_forget()
 
     def toggle_pause(self):
+        if self.finished:
+            return  # The clock stopped for good when the puzzle was completed
         if not self.paused:
             self.paused = True
             self.pause_btn.config(text="Resume")
-            self.pause_time = time.time()
-            for i in range(9):
-                for j in range(9):
-                    self.entries[i][j].config(state="disabled")
+            self.clock.pause()
+            self.stop_score_ticker()
             self.show_pause_overlay()
         else:
             self.paused = False
             self.pause_btn.config(text="Pause")
-            self.start_time += time.time() - self.pause_time
-            for i in range(9):
-                for j in range(9):
-                    if self.sudoku.starting_board[i][j] == 0:
-                        self.entries[i][j].config(state="normal")
+            self.clock.resume()
+            self.start_score_ticker()
             self.hide_pause_overlay()
 
-    def check_user_entry(self, row, col):
-        if self.paused:
+    def on_cell_key(self, event, row, col):
+        # The typed key is the new cell value, so the entry is only ever
+        # written to, never read back. Other keys fall through to the window
+        # bindings (undo/redo) and focus traversal.
+        if self.paused or self.finished or self.model.is_given(row, col):
+            return "break"
+        if event.keysym in ("BackSpace", "Delete"):
+            old = self.model.get(row, col)
+            self.entries[row][col].delete(0, tk.END)
+            self.model.set(row, col, 0)
+            self.record_move(row, col, old)
+            return "break"
+        if not event.char or not event.char.isprintable():
+            return None
+        self.check_user_entry(row, col, event.char)
+        return "break"
+
+    def check_user_entry(self, row, col, val):
+        if self.paused or self.finished:
             return
-        val = self.entries[row][col].get()
         if not val.isdigit() or not (1 <= int(val) <= 9):
             self.entries[row][col].config(bg=ENTRY_WRONG_BG)
             return
-        correct = str(self.full_solution[row][col])
-        if val == correct:
+        old = self.model.get(row, col)
+        if self.model.is_correct(row, col, int(val)):
+            self.model.set(row, col, int(val))
+            self.entries[row][col].delete(0, tk.END)
+            self.entries[row][col].insert(0, val)
             self.entries[row][col].config(bg=ENTRY_CORRECT_BG)
-            self.entries[row][col].after(400, lambda e=self.entries[row][col]: e.config(bg=ENTRY_BG))
+            self.flasher.flash(row, col, ENTRY_BG, 400)
+            self.record_move(row, col, old)
             if self.is_puzzle_complete():
                 self.show_score(final=True)
         else:
             self.entries[row][col].config(bg=ENTRY_WRONG_BG)
-            self.entries[row][col].after(800, lambda e=self.entries[row][col]: e.config(bg=ENTRY_BG))
+            self.flasher.flash(row, col, ENTRY_BG, 800)
             self.entries[row][col].delete(0, tk.END)
+            self.model.set(row, col, 0)
             self.mistakes_made += 1
+            self.record_move(row, col, old)
             self.show_score()
 
     def is_puzzle_complete(self):
-        for i in range(9):
-            for j in range(9):
-                val = self.entries[i][j].get()
-                if str(val) != str(self.full_solution[i][j]):
-                    return False
-        return True
+        return self.model.is_complete()
 
     def solve_board(self):
-        if self.paused:
+        if self.paused or self.finished:
             return
         for i in range(9):
             for j in range(9):
@@ -687,60 +1089,101 @@ class SudokuApp:
                 self.entries[i][j].delete(0, tk.END)
                 self.entries[i][j].insert(0, str(self.full_solution[i][j]))
                 self.entries[i][j].config(disabledforeground=ACCENT, fg=ACCENT)
-        self.show_score(final=True)
-
-    def get_solved_board(self):
-        if self.solved_board:
-            return self.solved_board
-        temp = Sudoku(self.sudoku.starting_board)
-        if temp.solve():
-            self.solved_board = temp.board
-            return self.solved_board
-        return None
+        self.model.fill_solution()
+        self.show_score(final=True, record=False)
 
     def give_hint(self):
+        # Fills the cell the next logical step solves, with the technique shown
         if self.paused:
             return
-        solved = self.get_solved_board()
-        if not solved:
-            messagebox.showinfo("Sudoku", "No solution available for hints!")
+        step = next_step(self.model)
+        if step is None:
+            messagebox.showinfo("Sudoku", "No empty cells left for hints!")
             return
-        for i in range(9):
-            for j in range(9):
-                entry_val = self.entries[i][j].get()
-                if entry_val == "" or entry_val == "0":
-                    self.entries[i][j].config(state='normal')
-                    self.entries[i][j].delete(0, tk.END)
-                    self.entries[i][j].insert(0, str(solved[i][j]))
-                    self.entries[i][j].config(disabledforeground="#0984e3", fg="#0984e3", bg=ENTRY_HINT_BG)
-                    self.entries[i][j].after(800, lambda e=self.entries[i][j]: e.config(bg=ENTRY_BG))
-                    self.hints_used += 1
-                    self.show_score()
-                    return
-        messagebox.showinfo("Sudoku", "No empty cells left for hints!")
-
-    def show_score(self, final=False):
-        if self.start_time is None:
-            score = 0
+        i, j, digit, level, eliminations = step
+        self.model.set(i, j, digit)
+        self.entries[i][j].config(state='normal')
+        self.entries[i][j].delete(0, tk.END)
+        self.entries[i][j].insert(0, str(digit))
+        self.entries[i][j].config(disabledforeground="#0984e3", fg="#0984e3", bg=ENTRY_HINT_BG)
+        self.flasher.flash(i, j, ENTRY_BG, 800)
+        self.hints_used += 1
+        self.record_move(i, j, 0)
+        if not LIVE_HINTS:
+            self.update_hint_label(f"Hint: row {i + 1}, column {j + 1} ({level_name(level)})")
+        if self.is_puzzle_complete():
+            self.show_score(final=True)
         else:
-            elapsed = int(time.time() - self.start_time) if not self.paused else int(self.pause_time - self.start_time)
-            base = 1000
-            bonus = DIFFICULTY_BONUS[self.difficulty]
-            time_penalty = elapsed
-            hint_penalty = 100 * self.hints_used
-            mistake_penalty = 50 * self.mistakes_made
-            score = max(0, base + bonus - time_penalty - hint_penalty - mistake_penalty)
+            self.show_score()
+
+    def current_score(self):
+        if self.difficulty is None:
+            return 0
+        elapsed = int(self.clock.elapsed())
+        inputs = (self.difficulty, elapsed, self.hints_used, self.mistakes_made)
+        if inputs == self.score_inputs:
+            return self.last_score
+        self.last_score = scoring.score(self.difficulty, elapsed, self.hints_used, self.mistakes_made)
+        self.score_inputs = inputs
+        return self.last_score
+
+    def refresh_score(self):
+        score = self.current_score()
+        if score == self.shown_score:
+            return score
         if getattr(self, "score_label", None):
-            try: self.score_label.config(text=f"Score: {score}")
+            try:
+                self.score_label.config(text=f"Score: {score}")
+                self.shown_score = score
             except tk.TclError: pass
+        return score
+
+    def start_score_ticker(self):
+        if self.score_after_id is None:
+            self.score_after_id = self.root.after(1000, self.tick_score)
+
+    def stop_score_ticker(self):
+        if self.score_after_id is not None:
+            self.root.after_cancel(self.score_after_id)
+            self.score_after_id = None
+
+    def tick_score(self):
+        # Fire just after the next whole second of play so the label never lags.
+        # The ticker only runs while a game is being played.
+        self.score_after_id = None
+        if self.paused or self.finished:
+            return
+        delay = int(1000 - (self.clock.elapsed() % 1) * 1000) + 5
+        self.score_after_id = self.root.after(delay, self.tick_score)
+        self.refresh_score()
+        self.journal.note_time(self.clock.elapsed())
+
+    def show_score(self, final=False, record=True):
+        # A game is summed up once. Only games the player completed are
+        # recorded; a board filled by the Solve button is neither stored nor
+        # ranked.
+        if final and self.finished:
+            return
+        if final:
+            self.clock.pause()
+            self.stop_score_ticker()
+            self.finished = True
+            self.journal.discard()
+            self.update_hint_label()
+        score = self.refresh_score()
         if final:
             old_high = self.get_highscore()
-            if score > old_high:
-                self.save_highscore(score)
-                hs_msg = f"New High Score for {self.difficulty.title()}!"
+            if not record:
+                hs_msg = "Solved with the Solve button, so this game is not recorded."
             else:
-                hs_msg = f"High Score for {self.difficulty.title()}: {old_high}"
-            elapsed = int(time.time() - self.start_time) if not self.paused else int(self.pause_time - self.start_time)
+                get_storage().record_game(self.username, self.difficulty, score, self.clock.elapsed(),
+                                          self.hints_used, self.mistakes_made, Board(self.model.givens).to_string())
+                if score > old_high:
+                    self.save_highscore(score)
+                    hs_msg = f"New High Score for {self.difficulty.title()}!"
+                else:
+                    hs_msg = f"High Score for {self.difficulty.title()}: {old_high}"
+            elapsed = int(self.clock.elapsed())
             msg = (
                 f"Congratulations! Puzzle complete.\n\n"
                 f"Difficulty: {self.difficulty.title()}\n"
@@ -751,13 +1194,14 @@ class SudokuApp:
                 f"{hs_msg}"
             )
             messagebox.showinfo("Score Summary", msg)
-            self.create_highscore_label()
+            self.update_highscore_label()
 
     def create_score_label(self):
         if getattr(self, "score_label", None):
             self.score_label.destroy()
         self.score_label = tk.Label(self.root, text="Score: 0", font=("Arial", 16),
                                     bg=self.bg, fg=ACCENT)
+        self.shown_score = None
         self.score_label.pack(pady=2)
 
     def create_highscore_label(self):
@@ -769,30 +1213,85 @@ class SudokuApp:
             bg=self.bg, fg=DESC_FG)
         self.highscore_label.pack(pady=1)
 
-    def reset_board(self):
-        self.sudoku = Sudoku(self.sudoku.starting_board)
-        self.solved_board = None
-        self.hints_used = 0
-        self.mistakes_made = 0
-        self.start_time = time.time()
-        self.paused = False
-        if getattr(self, "score_label", None):
-            try: self.score_label.config(text="Score: 0")
-            except tk.TclError: pass
-        if getattr(self, "pause_btn", None):
-            try: self.pause_btn.config(text="Pause")
-            except tk.TclError: pass
+    def create_hint_label(self):
+        if getattr(self, "hint_label", None):
+            self.hint_label.destroy()
+        self.hint_label = tk.Label(self.root, text="", font=("Arial", 12), bg=self.bg, fg=DESC_FG)
+        self.hint_label.pack(pady=1)
+
+    def update_hint_label(self, text=None):
+        # Without text, shows the next logical step when live hints are on
+        if getattr(self, "hint_label", None) is None:
+            return
+        if text is None:
+            text = ""
+            step = next_step(self.model) if LIVE_HINTS and not self.finished else None
+            if step is not None:
+                i, j, digit, level, eliminations = step
+                text = f"Next step: row {i + 1}, column {j + 1} ({level_name(level)})"
+        self.hint_label.config(text=text)
+
+    def update_highscore_label(self):
+        if self.reuse_widgets and getattr(self, "highscore_label", None):
+            self.highscore_label.config(text=f"High Score ({self.difficulty.title()}): {self.get_highscore()}")
+        else:
+            self.create_highscore_label()
+
+    def fill_entries(self):
+        self.flasher.cancel_all()
+        givens = self.sudoku.starting_board.cells
         for i in range(9):
             for j in range(9):
                 self.entries[i][j].config(state='normal', fg=ENTRY_FG, bg=ENTRY_BG)
                 self.entries[i][j].delete(0, tk.END)
-                val = self.sudoku.starting_board[i][j]
+                val = givens[i * 9 + j]
                 if val != 0:
                     self.entries[i][j].insert(0, str(val))
                     self.entries[i][j].config(state='disabled', disabledbackground=ENTRY_DISABLED_BG, disabledforeground=ENTRY_DISABLED_FG)
 
+    def reset_board(self):
+        # Only the cells the player changed are rewound. A solved board has
+        # restyled every cell, so that one is redrawn in full.
+        redraw = self.finished
+        cells = self.model.rewind()
+        self.history.clear()
+        self.hints_used = 0
+        self.mistakes_made = 0
+        self.paused = False
+        self.finished = False
+        self.clock.restart()
+        self.begin_journal()
+        self.update_hint_label()
+        self.refresh_score()
+        self.start_score_ticker()
+        if getattr(self, "pause_btn", None):
+            try: self.pause_btn.config(text="Pause")
+            except tk.TclError: pass
+        self.hide_pause_overlay()
+        if redraw:
+            self.fill_entries()
+            return
+        for row, col in list(self.flasher.latest):
+            self.set_cell_bg(row, col, ENTRY_BG)
+        self.flasher.cancel_all()
+        for idx in cells:
+            i, j = divmod(idx, 9)
+            self.entries[i][j].config(state='normal', fg=ENTRY_FG, bg=ENTRY_BG)
+            self.entries[i][j].delete(0, tk.END)
+
     def new_puzzle(self):
+        self.stop_score_ticker()
+        if self.in_game and not self.finished:
+            # Time spent on the menu is not play time; the journal keeps the
+            # abandoned game, with the time played, for the next launch.
+            self.clock.pause()
+            if self.journal is not None:
+                self.journal.note_time(self.clock.elapsed())
+        self.in_game = False
         self.root.withdraw()
+        if self.reuse_widgets:
+            self.show_menu()
+            return
         if getattr(self, "board_frame", None):
             self.board_frame.destroy()
         if getattr(self, "controls", None):
@@ -801,35 +1300,26 @@ class SudokuApp:
             self.score_label.destroy()
         if getattr(self, "highscore_label", None):
             self.highscore_label.destroy()
-        SudokuMenu(self.root, self.start_game, self.username, self.account_switch_menu)
+        if getattr(self, "hint_label", None):
+            self.hint_label.destroy()
+            self.hint_label = None
+        self.show_menu()
 
     def update_board_from_entries(self):
-        for i in range(9):
-            for j in range(9):
-                val = self.entries[i][j].get()
-                if val.isdigit():
-                    self.sudoku.board[i][j] = int(val)
-                else:
-                    self.sudoku.board[i][j] = 0
+        self.sudoku.board.cells[:] = self.model.values
 
     def load_highscores(self):
-        if not os.path.exists(HIGHSCORE_FILE):
-            self.highscores = {}
-        else:
-            try:
-                with open(HIGHSCORE_FILE, "r") as f:
-                    self.highscores = json.load(f)
-            except Exception:
-                self.highscores = {}
-        if self.username not in self.highscores:
-            self.highscores[self.username] = {"easy": 0, "medium": 0, "hard": 0}
+        # Only the current user's scores are kept in memory
+        scores = {"easy": 0, "medium": 0, "hard": 0}
+        scores.update(get_storage().highscores(self.username))
+        self.highscores = {self.username: scores}
 
     def save_highscore(self, score):
         if self.username not in self.highscores:
             self.highscores[self.username] = {"easy": 0, "medium": 0, "hard": 0}
-        self.highscores[self.username][self.difficulty] = score
-        with open(HIGHSCORE_FILE, "w") as f:
-            json.dump(self.highscores, f)
+        # Another instance may have stored a better score meanwhile; keep the best
+        best = get_storage().save_highscore(self.username, self.difficulty, score)
+        self.highscores[self.username][self.difficulty] = best
 
     def get_highscore(self):
         if self.username not in self.highscores:
@@ -837,10 +1327,25 @@ class SudokuApp:
         return self.highscores[self.username].get(self.difficulty, 0)
 
 if __name__ == "__main__":
+    instrument.start_profiling()
     root = tk.Tk()
     root.configure(bg=DARK_BG)
     root.geometry("900x850")
     root.resizable(False, False)
     root.withdraw()  # Hide until menu is ready
-    app = SudokuApp(root)
+    app = SudokuApp(root, renderer="canvas" if "--canvas" in sys.argv[1:] else BOARD_RENDERER)
+    if "--startup-time" in sys.argv[1:]:
+        since = "process start" if STARTUP_AGE is not None else "module load"
+        root.after_idle(lambda: print(f"First interactive frame {(time.perf_counter() - STARTUP_BEGAN) * 1000:.0f} ms after {since}"))
     root.mainloop()
+    if app.journal is not None:
+        if app.in_game and not app.finished and app.journal.state is not None:
+            app.journal.note_time(app.clock.elapsed())
+        app.journal.close()
+    app.puzzle_pool.stop()
+    if _storage is not None:
+        _storage.close()
+    if instrument.ENABLED:
+        app.dump_metrics()
+    for path in instrument.stop_profiling(PROFILE_PREFIX):
+        print("Profile written to", path)
@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import os
+import random
+import sys
+
+import pytest
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, CODE_DIR)
+
+from nexus_sudoku.board import Board
+from nexus_sudoku.generator import FullBoardGenerator, make_unique_puzzle
+
+EASY_PUZZLE = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+EASY_SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+HARD_PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+@pytest.fixture
+def easy():
+    return Board.from_string(EASY_PUZZLE), Board.from_string(EASY_SOLUTION)
+
+
+@pytest.fixture
+def hard():
+    return Board.from_string(HARD_PUZZLE)
+
+
+@pytest.fixture(scope="session")
+def generated():
+    # A few (puzzle, solution) pairs from a fixed seed, shared by the session.
+    generator = FullBoardGenerator(random.Random(2025))
+    pairs = []
+    for clues in (36, 32, 28):
+        solution = generator.generate_board()
+        puzzle, attempts = make_unique_puzzle(solution, clues, generator.rng)
+        pairs.append((puzzle, solution))
+    return pairs
+
+
+def is_solved_grid(cells):
+    cells = list(cells)
+    rows = [cells[r * 9:r * 9 + 9] for r in range(9)]
+    cols = [cells[c::9] for c in range(9)]
+    boxes = [[cells[(3 * (b // 3) + i) * 9 + 3 * (b % 3) + j] for i in range(3) for j in range(3)] for b in range(9)]
+    return all(sorted(unit) == list(range(1, 10)) for unit in rows + cols + boxes)
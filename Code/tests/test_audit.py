@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nexus_sudoku import audit
+from nexus_sudoku.scoring import score
+from nexus_sudoku.storage import Storage, open_storage
+
+
+def fill(storage):
+    games = [("ana", "easy", 120.5, 1, 2), ("ana", "hard", 300.0, 0, 0), ("bo", "medium", 30.0, 0, 1)]
+    for username, difficulty, elapsed, hints, mistakes in games:
+        points = score(difficulty, elapsed, hints, mistakes)
+        storage.record_game(username, difficulty, points, elapsed, hints, mistakes)
+        storage.save_highscore(username, difficulty, points)
+
+
+def test_score_many_matches_score():
+    difficulty = ["easy", "hard", "medium", "easy"]
+    elapsed = [10.7, 2000.0, 59.0, 0.0]
+    hints = [0, 1, 2, 3]
+    mistakes = [4, 0, 1, 0]
+    expected = [score(*args) for args in zip(difficulty, elapsed, hints, mistakes)]
+    assert audit.score_many(difficulty, elapsed, hints, mistakes).tolist() == expected
+    assert audit.score_many(["expert"], [0], [0], [0]).tolist() == [-1]
+
+
+def test_clean_history(tmp_path):
+    with Storage(str(tmp_path / "db")) as storage:
+        fill(storage)
+        checked, mismatched, best, unknown = audit.audit_games(storage, chunk=2)
+        assert (checked, mismatched, unknown) == (3, [], [])
+        assert best[("ana", "hard")] == score("hard", 300, 0, 0)
+        assert audit.audit_highscores(audit.stored_highscores(storage), best) == []
+
+
+def test_tampered_scores_are_found(tmp_path):
+    with Storage(str(tmp_path / "db")) as storage:
+        fill(storage)
+        storage.record_game("bo", "expert", 5000, 1.0, 0, 0)
+        game = storage.record_game("bo", "easy", 999, 50.0, 0, 0)
+        storage.save_highscore("ana", "medium", 900)
+        storage.save_highscore("bo", "hard", 9000)
+        checked, mismatched, best, unknown = audit.audit_games(storage)
+        assert mismatched == [(game, 999, score("easy", 50, 0, 0))]
+        assert [difficulty for game_id, difficulty in unknown] == ["expert"]
+        reasons = {(u, d): reason for u, d, claimed, reason in
+                   audit.audit_highscores(audit.stored_highscores(storage), best)}
+        assert reasons == {("ana", "medium"): "no recorded game", ("bo", "hard"): "above the maximum possible score"}
+
+
+def test_imported_highscores_are_counted_apart(tmp_path, capsys):
+    scores = tmp_path / "highscores.json"
+    scores.write_text(json.dumps({"carla": {"easy": 800, "hard": 5000}}))
+    db = str(tmp_path / "db")
+    with open_storage(db, highscore_file=str(scores)) as storage:
+        fill(storage)
+        assert storage.imported_highscores() == {("carla", "easy"), ("carla", "hard")}
+    assert audit.main([db]) == 1
+    out = capsys.readouterr().out
+    assert "carla (hard): 5000, above the maximum possible score" in out
+    assert "carla (easy)" not in out
+    assert "2 high scores imported" in out
+
+
+def test_beating_an_imported_highscore_clears_the_flag(tmp_path):
+    scores = tmp_path / "highscores.json"
+    scores.write_text(json.dumps({"ana": {"easy": 100}}))
+    with open_storage(str(tmp_path / "db"), highscore_file=str(scores)) as storage:
+        storage.save_highscore("ana", "easy", 50)
+        assert storage.imported_highscores() == {("ana", "easy")}
+        storage.save_highscore("ana", "easy", 700)
+        assert storage.imported_highscores() == set()
+
+
+def test_old_databases_are_migrated(tmp_path):
+    db = str(tmp_path / "db")
+    old = sqlite3.connect(db)
+    old.executescript("""
+        CREATE TABLE highscores (username TEXT NOT NULL, difficulty TEXT NOT NULL, score INTEGER NOT NULL,
+                                 PRIMARY KEY (username, difficulty));
+        CREATE TABLE games (id INTEGER PRIMARY KEY, username TEXT NOT NULL, difficulty TEXT NOT NULL,
+                            score INTEGER NOT NULL, elapsed REAL NOT NULL, hints INTEGER NOT NULL,
+                            mistakes INTEGER NOT NULL, puzzle TEXT, finished REAL NOT NULL);
+        INSERT INTO highscores VALUES ('ana', 'easy', 900), ('ana', 'hard', 1500);
+        INSERT INTO games VALUES (1, 'ana', 'hard', 1500, 100.0, 0, 0, NULL, 0.0);
+    """)
+    old.commit()
+    old.close()
+    with Storage(db) as storage:
+        assert storage.imported_highscores() == {("ana", "easy")}
+
+
+def test_malformed_highscores_are_suspect(tmp_path, capsys):
+    db = str(tmp_path / "db")
+    with Storage(db) as storage:
+        fill(storage)
+    scores = tmp_path / "highscores.json"
+    scores.write_text(json.dumps({"ana": {"easy": "x", "hard": -5, "medium": 1.5}, "bo": [1, 2]}))
+    assert audit.main([db, "--highscores", str(scores)]) == 1
+    out = capsys.readouterr().out
+    assert "4 suspect high scores" in out
+    assert "ana (easy): 'x', malformed entry" in out
+    assert "bo: [1, 2], malformed entry" in out
+    for broken in ("{not json", "[1, 2]"):
+        scores.write_text(broken)
+        assert audit.main([db, "--highscores", str(scores)]) == 2
+        assert "Cannot audit" in capsys.readouterr().err
+
+
+def test_missing_database_is_not_created(tmp_path, capsys):
+    db = str(tmp_path / "typo.db")
+    assert audit.main([db]) == 2
+    assert not os.path.exists(db)
+    assert "Cannot audit" in capsys.readouterr().err
+
+
+def test_readonly_storage_never_writes(tmp_path):
+    db = str(tmp_path / "db")
+    with Storage(db) as storage:
+        fill(storage)
+    with Storage(db, readonly=True) as storage:
+        assert storage.game_count("ana", "easy") == 1
+        with pytest.raises(sqlite3.OperationalError):
+            storage.add_user("mallory")
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import gc
+import random
+
+import pytest
+
+from nexus_sudoku.bank import HEADER, PuzzleBank, convert_jsonl, pack_cells, unpack_cells, write_bank
+from nexus_sudoku.grid import flatten
+
+
+def records(generated):
+    for n, (puzzle, solution) in enumerate(generated):
+        yield flatten(puzzle), flatten(solution), ("easy", "medium", "hard")[n], n + 1
+
+
+def test_pack_round_trip():
+    cells = [random.Random(1).randrange(10) for _ in range(81)]
+    assert len(pack_cells(cells)) == 41
+    assert unpack_cells(pack_cells(cells)) == cells
+
+
+def test_bank_round_trip(tmp_path, generated):
+    path = str(tmp_path / "puzzles.bank")
+    expected = list(records(generated))
+    assert write_bank(path, expected) == len(expected)
+    with PuzzleBank(path) as bank:
+        assert len(bank) == len(expected)
+        assert bank.names == ["easy", "medium", "hard"]
+        for k, (puzzle, solution, difficulty, level) in enumerate(expected):
+            got = bank.get(k)
+            assert (flatten(got[0]), flatten(got[1]), got[2], got[3]) == (puzzle, solution, difficulty, level)
+        assert bank.count_for("hard") == 1
+        assert bank.count_for("expert") == 0
+        assert flatten(bank.get_for("medium", 0)[0]) == expected[1][0]
+        assert flatten(bank.random("easy")[1]) == expected[0][1]
+        with pytest.raises(IndexError):
+            bank.get(len(expected))
+
+
+def test_convert_jsonl(tmp_path, generated):
+    jsonl = tmp_path / "hard.jsonl"
+    lines = []
+    for puzzle, solution, difficulty, level in records(generated):
+        lines.append('{"puzzle": "%s", "solution": "%s", "difficulty": "%s"}' % (
+            "".join(map(str, puzzle)), "".join(map(str, solution)), difficulty))
+    jsonl.write_text("\n".join(lines) + "\n")
+    path = str(tmp_path / "puzzles.bank")
+    assert convert_jsonl(str(jsonl), path) == len(lines)
+    with PuzzleBank(path) as bank:
+        assert bank.get(0)[3] == 0
+
+
+def test_not_a_bank(tmp_path):
+    path = tmp_path / "puzzles.bank"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        PuzzleBank(str(path))
+    path.write_bytes(b"XXXX" + bytes(64))
+    with pytest.raises(ValueError):
+        PuzzleBank(str(path))
+
+
+def test_corrupt_bank_is_closed(tmp_path, generated, recwarn):
+    path = tmp_path / "puzzles.bank"
+    write_bank(str(path), records(generated))
+    data = path.read_bytes()
+    for broken in (data[:HEADER.size - 1], data[:-1]):
+        path.write_bytes(broken)
+        with pytest.raises(ValueError):
+            PuzzleBank(str(path))
+    gc.collect()
+    assert not [w for w in recwarn if issubclass(w.category, ResourceWarning)]
+
+
+def test_long_difficulty_name(tmp_path):
+    cells = [0] * 81
+    with pytest.raises(ValueError):
+        write_bank(str(tmp_path / "puzzles.bank"), [(cells, cells, "nightmare", 0)])
@@ -0,0 +1,31 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nexus_sudoku import batch
+
+
+def test_validate(easy):
+    puzzle, solution = easy
+    broken = solution.copy()
+    broken[0, 0], broken[0, 1] = broken[0, 1], broken[0, 0]
+    broken[8, 8] = broken[8, 7]
+    valid, conflicts, complete = batch.validate([puzzle, solution, broken])
+    assert valid.tolist() == [True, True, False]
+    assert complete.tolist() == [False, True, False]
+    assert conflicts[0].sum() == 0
+    assert conflicts[2, 8, 8] and conflicts[2, 8, 7]
+
+
+def test_solve_singles(easy, hard):
+    puzzle, solution = easy
+    grids, solved = batch.solve_singles([puzzle, hard])
+    assert solved.tolist() == [True, False]
+    assert grids[0].reshape(-1).tolist() == list(solution.cells)
+
+
+def test_as_grids_rejects_bad_values():
+    with pytest.raises(ValueError):
+        batch.as_grids([[10] * 81])
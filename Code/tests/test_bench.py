@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from bench_suite import check
+
+
+def test_thresholds_scale_with_calibration():
+    metrics = {
+        "solve.fast": {"value": 600, "unit": "solves/s", "better": "higher"},
+        "ui.build": {"value": 150, "unit": "ms", "better": "lower"},
+    }
+    thresholds = {"solve.fast": {"min": 1000}, "ui.build": {"max": 100}}
+    assert len(check(metrics, thresholds)) == 2
+    assert check(metrics, thresholds, scale=0.5) == []
+    assert len(check(metrics, thresholds, scale=2.0)) == 2
+
+
+def test_baseline_scales_with_calibration():
+    metrics = {"solve.fast": {"value": 600, "unit": "solves/s", "better": "higher"}}
+    baseline = {"solve.fast": {"value": 1000, "unit": "solves/s", "better": "higher"}}
+    assert len(check(metrics, {}, baseline)) == 1
+    assert check(metrics, {}, baseline, baseline_scale=0.6) == []
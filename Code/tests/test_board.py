@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import pytest
+
+from nexus_sudoku.board import Board
+from nexus_sudoku.grid import flatten, unflatten, from_string, to_string
+
+from conftest import EASY_PUZZLE
+
+
+def test_string_and_list_round_trip():
+    board = Board.from_string(EASY_PUZZLE)
+    assert board.to_string() == EASY_PUZZLE
+    assert Board.from_lists(board.to_lists()) == board
+    assert to_string(from_string(EASY_PUZZLE)) == EASY_PUZZLE
+    assert flatten(unflatten(list(board.cells))) == list(board.cells)
+
+
+def test_indexing_matches_nested_lists():
+    board = Board.from_string(EASY_PUZZLE)
+    lists = board.to_lists()
+    for r in range(9):
+        for c in range(9):
+            assert board[r][c] == board[r, c] == lists[r][c]
+    board[4, 4] = 7
+    assert board.cells[40] == 7
+    board[4][4] = 0
+    assert board[4, 4] == 0
+
+
+def test_copy_is_independent():
+    board = Board.from_string(EASY_PUZZLE)
+    copy = board.copy()
+    copy[0, 2] = 4
+    assert board[0, 2] == 0
+    assert copy != board
+    assert hash(board) == hash(Board.from_string(EASY_PUZZLE))
+
+
+def test_units_and_clues():
+    board = Board.from_string(EASY_PUZZLE)
+    assert board.clues() == 30
+    assert board.row(0) == bytes([5, 3, 0, 0, 7, 0, 0, 0, 0])
+    assert board.col(0) == bytes([5, 6, 0, 8, 4, 7, 0, 0, 0])
+    assert board.box(0) == bytes([5, 3, 0, 6, 0, 0, 0, 9, 8])
+    assert len(board.units()) == 27
+
+
+def test_wrong_size_is_rejected():
+    with pytest.raises(ValueError):
+        Board(range(80))
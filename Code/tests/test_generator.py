@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import random
+
+from nexus_sudoku import generate
+from nexus_sudoku.board import Board
+from nexus_sudoku.dlx import count_solutions
+from nexus_sudoku.generator import (CANONICAL_BOARD, DIFFICULTY_LEVELS, FullBoardGenerator, generate_full_board,
+                                    make_rated_puzzle, make_unique_puzzle, transform_board)
+from nexus_sudoku.grid import flatten
+
+from conftest import is_solved_grid
+
+
+def test_full_boards_are_valid():
+    generator = FullBoardGenerator(random.Random(7))
+    for _ in range(20):
+        assert is_solved_grid(flatten(generator.generate()))
+    assert is_solved_grid(generator.generate_board().cells)
+    assert is_solved_grid(flatten(generate_full_board(random.Random(1), transformed=True)))
+
+
+def test_same_seed_same_board():
+    assert FullBoardGenerator(random.Random(3)).generate() == FullBoardGenerator(random.Random(3)).generate()
+
+
+def test_transforms_preserve_validity():
+    assert is_solved_grid(flatten(CANONICAL_BOARD))
+    rng = random.Random(11)
+    for _ in range(20):
+        assert is_solved_grid(flatten(transform_board(CANONICAL_BOARD, rng)))
+
+
+def test_unique_puzzles(generated):
+    for puzzle, solution in generated:
+        assert isinstance(puzzle, Board)
+        assert count_solutions(puzzle, limit=2) == 1
+        assert all(not v or v == solution.cells[idx] for idx, v in enumerate(puzzle.cells))
+
+
+def test_unique_puzzle_reaches_the_clue_count():
+    rng = random.Random(5)
+    solution = FullBoardGenerator(rng).generate()
+    puzzle, attempts = make_unique_puzzle(solution, 32, rng)
+    assert isinstance(puzzle, list)
+    assert sum(v != 0 for row in puzzle for v in row) == 32
+    assert 1 <= attempts
+
+
+def test_rated_chunks_stay_in_band(monkeypatch):
+    # One board per call, so most calls hand back an out-of-band puzzle
+    monkeypatch.setattr(generate, "make_rated_puzzle",
+                        lambda generator, difficulty: make_rated_puzzle(generator, difficulty, max_boards=1))
+    low, high = DIFFICULTY_LEVELS["hard"]
+    index, records = generate.generate_chunk("hard", 1, 0, 3, rated=True)
+    assert [low <= record["level"] <= high for record in records] == [True] * 3
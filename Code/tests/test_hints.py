@@ -0,0 +1,42 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from nexus_sudoku.hints import next_step
+from nexus_sudoku.model import GameModel
+from nexus_sudoku.rating import LEVEL_TRIAL, rate
+from nexus_sudoku.solver import solve_board
+
+
+def play_hints(model):
+    levels = []
+    while True:
+        step = next_step(model)
+        if step is None:
+            return levels
+        row, col, digit, level, eliminations = step
+        assert model.is_correct(row, col, digit)
+        assert not model.get(row, col)
+        model.set(row, col, digit)
+        levels.append(level)
+
+
+def test_hints_solve_the_puzzle(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    levels = play_hints(model)
+    assert model.is_complete()
+    assert len(levels) == 81 - puzzle.clues()
+    assert max(levels) == rate(puzzle)
+
+
+def test_hints_on_a_hard_puzzle(hard):
+    model = GameModel(hard, solve_board(hard))
+    levels = play_hints(model)
+    assert model.is_complete()
+    assert LEVEL_TRIAL in levels
+
+
+def test_no_hint_on_a_full_board(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    model.fill_solution()
+    assert next_step(model) is None
@@ -0,0 +1,38 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from nexus_sudoku.history import MoveHistory
+
+
+def test_undo_redo():
+    history = MoveHistory()
+    history.push(0, 0, 5)
+    history.push(80, 5, 9)
+    assert history.undo() == (80, 5, 9)
+    assert history.undo() == (0, 0, 5)
+    assert history.undo() is None
+    assert history.redo() == (0, 0, 5)
+    assert history.can_redo()
+
+
+def test_new_move_drops_the_redo_tail():
+    history = MoveHistory()
+    for cell in range(5):
+        history.push(cell, 0, 1)
+    history.undo()
+    history.undo()
+    history.push(40, 2, 3)
+    assert not history.can_redo()
+    assert len(history) == 4
+    assert history.undo() == (40, 2, 3)
+
+
+def test_limit_keeps_the_newest_moves():
+    history = MoveHistory(limit=8)
+    for cell in range(20):
+        history.push(cell, 0, 1)
+    assert len(history) <= 8
+    assert history.undo() == (19, 0, 1)
+    undone = 1
+    while history.undo() is not None:
+        undone += 1
+    assert undone == len(history)
@@ -0,0 +1,23 @@
+# Copyright (c) 2025 Manoel Del Piero
+#
+# The engine package must stay headless and cheap to import. Each module is
+# imported in a fresh interpreter; NEXUS_SUDOKU_IMPORT_BUDGET_MS overrides
+# the budget on slow machines.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from check_imports import DEFAULT_BUDGET_MS, MODULES, probe
+
+BUDGET_MS = float(os.environ.get("NEXUS_SUDOKU_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_is_headless_and_within_budget(module):
+    result = probe(module)
+    assert result["gui"] == []
+    assert result["ms"] <= BUDGET_MS
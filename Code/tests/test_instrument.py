@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import json
+
+import pytest
+
+from nexus_sudoku import instrument
+from nexus_sudoku.pool import PuzzlePool
+from nexus_sudoku.sudoku import Sudoku
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    # The decorators are fixed at import; the `if instrument.ENABLED` hooks
+    # are checked on every call.
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    instrument.reset()
+    yield
+    instrument.reset()
+
+
+def test_histogram_buckets():
+    histogram = instrument.Histogram()
+    for value in (0.5, 1, 3, 3, 100):
+        histogram.add(value)
+    summary = histogram.to_dict()
+    assert (summary["count"], summary["min"], summary["max"]) == (5, 0.5, 100)
+    assert summary["buckets"][:3] == [1, 1, 2]
+    assert summary["p50"] == 4
+    assert summary["p99"] == 128
+    assert instrument.Histogram().percentile(50) is None
+
+
+def test_counters_and_dump(tmp_path, enabled):
+    instrument.count("a")
+    instrument.count("a", 4)
+    instrument.observe("h", 7)
+    path = instrument.dump(str(tmp_path / "metrics.json"))
+    with open(path) as f:
+        data = json.load(f)
+    assert data["counters"] == {"a": 5}
+    assert data["histograms"]["h"]["count"] == 1
+    instrument.reset()
+    assert instrument.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_hot_paths_count_calls(easy, enabled):
+    puzzle, solution = easy
+    Sudoku(puzzle).solve()
+    broken = puzzle.copy()
+    broken[0, 2] = 5
+    Sudoku(broken).solve()
+    pool = PuzzlePool({"easy": 40}, depth=1)
+    pool.queues["easy"].append((puzzle, solution, 1))
+    pool.get("easy")
+    pool.get("easy")
+    counters = instrument.snapshot()["counters"]
+    assert counters["solver.calls"] == 2
+    assert counters["solver.unsolvable"] == 1
+    assert counters["pool.hits"] == 1
+    assert counters["pool.misses"] == 1
+    assert counters["generator.uniqueness_checks"] == counters["dlx.count_calls"] > 0
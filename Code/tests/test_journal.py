@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import time
+
+from nexus_sudoku.journal import GameJournal, load_journal
+
+from conftest import EASY_PUZZLE, EASY_SOLUTION
+
+
+def begin(journal):
+    puzzle = [int(ch) for ch in EASY_PUZZLE]
+    solution = [int(ch) for ch in EASY_SOLUTION]
+    journal.begin("ana", "easy", puzzle, solution)
+
+
+def test_replay(tmp_path):
+    path = str(tmp_path / "game.journal")
+    journal = GameJournal(path, interval=0)
+    begin(journal)
+    journal.record(2, 4, 0, 0, 1.5)
+    journal.record(3, 9, 0, 1, 2.0)
+    journal.record(3, 6, 1, 1, 3.25)
+    journal.note_time(7.5)
+    journal.close()
+    state = load_journal(path)
+    assert state["username"] == "ana"
+    assert state["puzzle"] == EASY_PUZZLE
+    assert state["values"][2:4] == "46"
+    assert (state["hints"], state["mistakes"], state["elapsed"]) == (1, 1, 7.5)
+
+
+def test_compaction_keeps_the_state(tmp_path):
+    path = str(tmp_path / "game.journal")
+    journal = GameJournal(path, interval=0, snapshot_every=4)
+    begin(journal)
+    empty = [idx for idx, ch in enumerate(EASY_PUZZLE) if ch == "0"]
+    for n, idx in enumerate(empty):
+        journal.record(idx, int(EASY_SOLUTION[idx]), 0, 0, float(n))
+    journal.close()
+    with open(path) as f:
+        assert len(f.readlines()) <= 4
+    state = load_journal(path)
+    assert state["values"] == EASY_SOLUTION
+    assert state["elapsed"] == len(empty) - 1
+
+
+def test_torn_line_ends_the_replay(tmp_path):
+    path = str(tmp_path / "game.journal")
+    journal = GameJournal(path, interval=0)
+    begin(journal)
+    journal.record(2, 4, 0, 0, 1.0)
+    journal.close()
+    with open(path, "a") as f:
+        f.write("M 3 6 0 0 2.0")
+    state = load_journal(path)
+    assert state["values"][2:4] == "40"
+    assert state["elapsed"] == 1.0
+
+
+def test_discard_and_missing_file(tmp_path):
+    path = str(tmp_path / "game.journal")
+    journal = GameJournal(path, interval=0)
+    begin(journal)
+    journal.discard()
+    journal.close()
+    assert load_journal(path) is None
+    with open(path, "w") as f:
+        f.write("garbage\n")
+    assert load_journal(path) is None
+
+
+def test_failed_write_does_not_stop_the_journal(tmp_path, capsys):
+    folder = tmp_path / "missing"
+    path = str(folder / "game.journal")
+    journal = GameJournal(path, interval=0)
+    begin(journal)
+    journal.record(2, 4, 0, 0, 1.0)
+    deadline = time.monotonic() + 5
+    while not journal._resync and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal._thread.is_alive()
+    assert "Game journal" in capsys.readouterr().err
+    folder.mkdir()
+    journal.record(3, 6, 0, 0, 2.0)
+    journal.close()
+    state = load_journal(path)
+    assert state["values"][2:4] == "46"
+    assert state["elapsed"] == 2.0
@@ -0,0 +1,63 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from nexus_sudoku.grid import PEERS
+from nexus_sudoku.model import GameModel
+from nexus_sudoku.scoring import BASE_SCORE, DIFFICULTY_BONUS, score
+
+
+def peer_candidates(model, idx):
+    if model.values[idx]:
+        return ()
+    used = {model.values[p] for p in PEERS[idx]}
+    return tuple(d for d in range(1, 10) if d not in used)
+
+
+def test_fill_to_completion(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    assert not model.is_complete()
+    assert model.first_empty() == (0, 2)
+    for idx in range(81):
+        if not model.is_given(*divmod(idx, 9)):
+            model.set(*divmod(idx, 9), solution.cells[idx])
+    assert model.is_complete()
+    assert model.first_empty() is None
+    assert model.board() == solution
+
+
+def test_candidates_stay_live(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    model.set(0, 2, 4)
+    model.set(4, 4, 5)
+    model.set(0, 2, 0)
+    for idx in range(81):
+        assert model.candidates(*divmod(idx, 9)) == peer_candidates(model, idx)
+
+
+def test_rewind_touches_only_changed_cells(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    model.set(0, 2, 4)
+    model.set(0, 3, 6)
+    model.set(0, 3, 0)
+    assert sorted(model.rewind()) == [2]
+    assert bytes(model.values) == model.givens
+    assert not model.changed
+
+
+def test_fill_solution(easy):
+    puzzle, solution = easy
+    model = GameModel(puzzle, solution)
+    model.fill_solution()
+    assert model.is_complete()
+    assert len(model.changed) == 81 - puzzle.clues()
+    model.rewind()
+    assert bytes(model.values) == model.givens
+    assert model.correct == puzzle.clues()
+
+
+def test_score():
+    assert score("hard", 0, 0, 0) == BASE_SCORE + DIFFICULTY_BONUS["hard"]
+    assert score("easy", 100.9, 1, 2) == BASE_SCORE - 100 - 100 - 100
+    assert score("easy", 10 ** 6, 0, 0) == 0
@@ -0,0 +1,43 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import time
+
+from nexus_sudoku.board import Board
+from nexus_sudoku.dlx import count_solutions
+from nexus_sudoku.pool import PuzzlePool
+from nexus_sudoku.rating import LEVEL_TRIAL, rate
+
+CLUES = {"easy": 40, "hard": 30}
+LEVELS = {"easy": (1, 1), "hard": (2, 7)}
+
+
+def test_miss_generates_unrated_with_the_pool_clues():
+    pool = PuzzlePool(CLUES, depth=1, rated=True, levels_by_difficulty=LEVELS)
+    puzzle, solution, attempts = pool.get("easy")
+    assert Board.from_lists(puzzle).clues() == 40
+    assert count_solutions(puzzle, limit=2) == 1
+    assert pool.stats()["misses"] == 1
+
+
+def test_rated_refill_stays_in_band():
+    pool = PuzzlePool({"easy": 40}, depth=2, rated=True, levels_by_difficulty=LEVELS)
+    pool.start()
+    try:
+        deadline = time.monotonic() + 30
+        while pool.stats()["ready"]["easy"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(2):
+            puzzle, solution, attempts = pool.get("easy")
+            assert Board.from_lists(puzzle).clues() == 40
+            assert rate(puzzle) == 1
+        assert pool.stats()["hits"] == 2
+    finally:
+        pool.stop()
+
+
+def test_out_of_band_puzzles_are_relabelled_or_dropped():
+    pool = PuzzlePool(CLUES, rated=True, levels_by_difficulty=LEVELS)
+    assert pool._band_of(1, "easy") == "easy"
+    assert pool._band_of(1, "hard") == "easy"
+    assert pool._band_of(3, "easy") == "hard"
+    assert pool._band_of(LEVEL_TRIAL, "hard") is None
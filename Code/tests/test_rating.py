@@ -0,0 +1,18 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+from nexus_sudoku.rating import LEVEL_NAMES, LEVEL_TRIAL, level_name, rate, rate_steps
+
+
+def test_levels(easy, hard):
+    puzzle, solution = easy
+    assert rate(puzzle) == 1
+    assert rate(solution) == 0
+    assert rate(hard) == LEVEL_TRIAL
+    assert level_name(LEVEL_TRIAL) == LEVEL_NAMES[-1]
+
+
+def test_steps_fill_every_cell(easy):
+    puzzle, solution = easy
+    level, steps = rate_steps(puzzle)
+    assert level == 1
+    assert sum(steps) > 0
@@ -0,0 +1,71 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import pytest
+
+from nexus_sudoku.board import Board
+from nexus_sudoku.dlx import DLXSolver, count_solutions, iter_solutions
+from nexus_sudoku.solver import BitmaskSolver, solve_backtracking, solve_board
+from nexus_sudoku.sudoku import Sudoku
+
+from conftest import EASY_SOLUTION, is_solved_grid
+
+
+def test_bitmask_solver(easy, hard):
+    puzzle, solution = easy
+    assert solve_board(puzzle) == solution.to_lists()
+    solver = BitmaskSolver(hard)
+    assert solver.solve()
+    assert is_solved_grid(solver.cells)
+
+
+def test_dlx_solver(easy, hard):
+    puzzle, solution = easy
+    assert DLXSolver(puzzle).solve() == solution.to_lists()
+    assert is_solved_grid(Board.from_lists(DLXSolver(hard).solve()).cells)
+
+
+def test_solvers_keep_the_givens(hard):
+    solver = BitmaskSolver(hard)
+    solver.solve()
+    assert all(not v or solver.cells[idx] == v for idx, v in enumerate(hard.cells))
+
+
+def test_backtracking_reference(easy):
+    puzzle, solution = easy
+    grid = puzzle.to_lists()
+    assert solve_backtracking(grid)
+    assert grid == solution.to_lists()
+
+
+def test_sudoku_solve_and_is_valid(easy):
+    puzzle, solution = easy
+    sudoku = Sudoku(puzzle)
+    assert sudoku.is_valid(0, 2, 4)
+    assert not sudoku.is_valid(0, 2, 5)  # row
+    assert not sudoku.is_valid(0, 2, 8)  # column
+    assert not sudoku.is_valid(0, 2, 6)  # box
+    assert not sudoku.is_valid(7, 7, 2)  # box away from the top left
+    assert sudoku.solve()
+    assert sudoku.board.to_string() == EASY_SOLUTION
+    assert sudoku.starting_board == puzzle
+
+
+def test_counting(easy):
+    puzzle, solution = easy
+    assert count_solutions(puzzle) == 1
+    assert count_solutions(solution) == 1
+    assert list(iter_solutions(puzzle)) == [solution.to_lists()]
+    assert count_solutions(Board(), limit=2) == 2
+
+
+@pytest.mark.parametrize("solve", [
+    lambda board: BitmaskSolver(board).solve(),
+    lambda board: DLXSolver(board).solve(),
+    lambda board: Sudoku(board).solve(),
+])
+def test_contradiction_has_no_solution(easy, solve):
+    puzzle, solution = easy
+    broken = puzzle.copy()
+    broken[0, 2] = 5  # a second 5 in row 0
+    assert not solve(broken)
+    assert count_solutions(broken) == 0
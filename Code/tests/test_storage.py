@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Manoel Del Piero
+
+import json
+import random
+
+import pytest
+
+from nexus_sudoku.storage import Storage, open_storage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with Storage(str(tmp_path / "nexus_sudoku.db")) as storage:
+        yield storage
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def test_json_import_runs_once(tmp_path):
+    users = write_json(tmp_path / "users.json", ["ana", "bo"])
+    scores = write_json(tmp_path / "highscores.json", {"ana": {"easy": 700, "hard": 1200}})
+    active = write_json(tmp_path / "user.json", {"username": "bo"})
+    db = str(tmp_path / "nexus_sudoku.db")
+    with open_storage(db, users, scores, active) as storage:
+        assert storage.users() == ["ana", "bo"]
+        assert storage.highscores("ana") == {"easy": 700, "hard": 1200}
+        assert storage.active_user() == "bo"
+    write_json(tmp_path / "users.json", ["carla"])
+    with Storage(db) as storage:
+        assert not storage.import_json(users, scores, active)
+        assert storage.users() == ["ana", "bo"]
+
+
+def test_corrupt_json_is_skipped(tmp_path):
+    users = write_json(tmp_path / "users.json", ["ana", None, 3])
+    scores = write_json(tmp_path / "highscores.json", {
+        "ana": {"easy": None, "medium": "abc", "hard": "900", "expert": [1], "huge": float("inf"), "big": 10 ** 30},
+        "bo": 12,
+        "carla": {"easy": 450.7},
+    })
+    active = tmp_path / "user.json"
+    active.write_text("{not json")
+    db = str(tmp_path / "nexus_sudoku.db")
+    with open_storage(db, users, scores, str(active)) as storage:
+        assert storage.users() == ["ana"]
+        assert storage.highscores("ana") == {"hard": 900}
+        assert storage.highscores("carla") == {"easy": 450}
+        assert storage.active_user() is None
+    with Storage(db) as storage:
+        assert not storage.import_json(users, scores, str(active))
+
+
+def test_users(storage):
+    assert storage.add_user("ana")
+    assert not storage.add_user("ana")
+    storage.add_users(["bo", "ana"])
+    assert storage.users() == ["ana", "bo"]
+    assert storage.has_user("bo")
+    storage.set_active_user("bo")
+    assert storage.active_user() == "bo"
+
+
+def test_highscore_keeps_the_best(storage):
+    assert storage.save_highscore("ana", "easy", 500) == 500
+    assert storage.save_highscore("ana", "easy", 400) == 500
+    assert storage.save_highscore("ana", "easy", 650) == 650
+    assert storage.highscore("ana", "hard") == 0
+
+
+def test_game_queries(storage):
+    for n, score in enumerate([300, 900, 600, 100]):
+        storage.record_game("ana", "easy", score, 60.0 + n, 0, 0, "0" * 81, finished=1000.0 + n)
+    storage.record_game("bo", "easy", 800, 50.0, 1, 0, finished=2000.0)
+    storage.record_game("ana", "hard", 50, 500.0, 3, 3, finished=3000.0)
+    assert [row[:2] for row in storage.top_scores("easy", 3)] == [("ana", 900), ("bo", 800), ("ana", 600)]
+    assert [row[1] for row in storage.recent_games("ana", 2)] == [50, 100]
+    assert [row[1] for row in storage.recent_games("ana", since=1001.5)] == [50, 100, 600]
+    assert storage.game_count("ana", "easy") == 4
+    assert storage.user_percentile("ana", "easy", 50) == 300
+    assert storage.user_percentile("ana", "easy", 100) == 900
+    assert storage.user_percentile("ana", "easy", 0) == 100
+    assert storage.user_percentile("bo", "hard", 50) is None
+    assert storage.percentile_rank("easy", 800) == 60.0
+    assert storage.percentile_rank("medium", 800) is None
+
+
+def test_user_percentile_is_nearest_rank(storage):
+    rng = random.Random(4)
+    scores = [rng.choice((0, 250, 251, 900, 1600)) for _ in range(97)]
+    for score in scores:
+        storage.record_game("ana", "medium", score, 1.0, 0, 0)
+    ordered = sorted(scores)
+    for p in (0, 1, 10, 33.3, 50, 75, 99, 100):
+        rank = min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))
+        assert storage.user_percentile("ana", "medium", p) == ordered[int(rank)]